@@ -6,7 +6,12 @@ from dotenv import load_dotenv
 
 from smart_contracts.config import contracts
 from smart_contracts.helpers.build import build
-from smart_contracts.helpers.deploy import deploy
+from smart_contracts.helpers.deploy import (
+    DeployCallback,
+    deploy,
+    deploy_to_targets,
+    get_deploy_targets,
+)
 
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s %(levelname)-10s: %(message)s"
@@ -17,6 +22,20 @@ load_dotenv()
 root_path = Path(__file__).parent
 
 
+def deploy_app(app_spec_path: Path, deploy_callback: DeployCallback) -> None:
+    # deploy to every network in DEPLOY_TARGETS if set, otherwise to the one
+    # configured by ALGOD_* and INDEXER_* environment variables
+    targets = get_deploy_targets()
+    if not targets:
+        deploy(app_spec_path, deploy_callback)
+        return
+
+    results = deploy_to_targets(app_spec_path, deploy_callback, targets)
+    failed = [result.target for result in results if not result.succeeded]
+    if failed:
+        raise Exception(f"Deployment failed for: {', '.join(failed)}")
+
+
 def main(action: str) -> None:
     artifact_path = root_path / "artifacts"
     match action:
@@ -29,14 +48,14 @@ def main(action: str) -> None:
                 logger.info(f"Deploying app {contract.app.name}")
                 app_spec_path = artifact_path / contract.app.name / "application.json"
                 if contract.deploy:
-                    deploy(app_spec_path, contract.deploy)
+                    deploy_app(app_spec_path, contract.deploy)
         case "all":
             for contract in contracts:
                 logger.info(f"Building app {contract.app.name}")
                 app_spec_path = build(artifact_path / contract.app.name, contract.app)
                 logger.info(f"Deploying {contract.app.name}")
                 if contract.deploy:
-                    deploy(app_spec_path, contract.deploy)
+                    deploy_app(app_spec_path, contract.deploy)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,5 @@
+from typing import Literal
+
 import beaker
 import pyteal as pt
 from algokit_utils import DELETABLE_TEMPLATE_NAME, UPDATABLE_TEMPLATE_NAME
@@ -33,6 +35,28 @@ def create(proposal: pt.abi.String, end_voting: pt.abi.Uint64) -> pt.Expr:
     ...
 
 
+@app.external(authorize=beaker.Authorize.only_creator())
+def set_proposal_document(
+    content_hash: pt.abi.StaticBytes[Literal[32]],
+    chunks: pt.abi.Uint64,
+    compressed: pt.abi.Bool,
+) -> pt.Expr:
+    # INSERT YOUR CODE HERE
+    ...
+
+
+@app.external(authorize=beaker.Authorize.only_creator())
+def put_proposal_chunk(index: pt.abi.Uint64, data: pt.abi.DynamicBytes) -> pt.Expr:
+    # INSERT YOUR CODE HERE
+    ...
+
+
+@app.external(authorize=beaker.Authorize.only_creator())
+def set_shard(index: pt.abi.Uint64, count: pt.abi.Uint64) -> pt.Expr:
+    # INSERT YOUR CODE HERE
+    ...
+
+
 @app.external(authorize=beaker.Authorize.only_creator())
 def bootstrap(*, output: pt.abi.Uint64) -> pt.Expr:
     # INSERT YOUR CODE HERE
@@ -63,6 +87,12 @@ def vote(in_favor: pt.abi.Bool) -> pt.Expr:
     ...
 
 
+@app.external(authorize=beaker.Authorize.only_creator())
+def reclaim(registered_asa: pt.abi.Asset) -> pt.Expr:
+    # INSERT YOUR CODE HERE
+    ...
+
+
 @app.external(read_only=True)
 def get_proposal(*, output: pt.abi.String) -> pt.Expr:
     # INSERT YOUR CODE HERE
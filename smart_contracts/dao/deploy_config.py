@@ -4,6 +4,8 @@ import algokit_utils
 from algosdk.v2client.algod import AlgodClient
 from algosdk.v2client.indexer import IndexerClient
 
+from smart_contracts.helpers.registry import AppRegistry
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,10 +20,14 @@ def deploy(
         DaoClient,
     )
 
+    registry = AppRegistry()
     app_client = DaoClient(
         algod_client,
         creator=deployer,
         indexer_client=indexer_client,
+        existing_deployments=registry.lookup(
+            algod_client, indexer_client, deployer.address, app_spec.contract.name
+        ),
     )
     is_mainnet = algokit_utils.is_mainnet(algod_client)
     app_client.deploy(
@@ -36,6 +42,7 @@ def deploy(
         allow_delete=not is_mainnet,
         allow_update=not is_mainnet,
     )
+    registry.record(algod_client, app_client.app_client.existing_deployments)
 
     name = "world"
     response = app_client.hello(name=name)
@@ -1,40 +1,113 @@
+import copy
+import dataclasses
 import logging
+import os
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib import parse
 
 from algokit_utils import (
     Account,
+    AlgoClientConfig,
     ApplicationSpecification,
     EnsureBalanceParameters,
     ensure_funded,
     get_account,
-    get_algod_client,
-    get_indexer_client,
+    get_kmd_wallet_account,
+    is_localnet,
 )
+from algosdk.kmd import KMDClient
 from algosdk.util import algos_to_microalgos
 from algosdk.v2client.algod import AlgodClient
 from algosdk.v2client.indexer import IndexerClient
 
+from smart_contracts.helpers.transport import get_algod_client, get_indexer_client
+
 logger = logging.getLogger(__name__)
 
+# Balance that tells the LocalNet dispenser apart from other default wallet accounts.
+LOCALNET_DISPENSER_MIN_BALANCE = 1_000_000_000
 
-def deploy(
-    app_spec_path: Path,
-    deploy_callback: Callable[
-        [AlgodClient, IndexerClient, ApplicationSpecification, Account], None
-    ],
-    deployer_initial_funds: int = 2,
-) -> None:
-    # get clients
-    # by default client configuration is loaded from environment variables
-    algod_client = get_algod_client()
-    indexer_client = get_indexer_client()
+DeployCallback = Callable[
+    [AlgodClient, IndexerClient, ApplicationSpecification, Account], None
+]
 
-    # get app spec
-    app_spec = ApplicationSpecification.from_json(app_spec_path.read_text())
 
+@dataclasses.dataclass
+class DeployTarget:
+    """A network to deploy to, read from `{NAME}_ALGOD_*` and `{NAME}_INDEXER_*`.
+
+    `kmd_port` is the port of the target's own KMD on the algod host, so several
+    LocalNet instances each use their own wallets and dispenser.
+    """
+
+    name: str
+    algod_config: AlgoClientConfig
+    indexer_config: AlgoClientConfig
+    deployer_name: str
+    kmd_port: str | None = None
+
+    def kmd_client(self) -> KMDClient | None:
+        if not self.kmd_port:
+            return None
+        parsed = parse.urlparse(self.algod_config.server)
+        server = parsed._replace(netloc=f"{parsed.hostname}:{self.kmd_port}").geturl()
+        return KMDClient(self.algod_config.token, server)
+
+
+@dataclasses.dataclass
+class DeployResult:
+    target: str
+    succeeded: bool
+    seconds: float
+    error: str | None = None
+
+
+def _config_from_environment(prefix: str) -> AlgoClientConfig:
+    server = os.getenv(f"{prefix}_SERVER")
+    if server is None:
+        raise Exception(f"Server environment variable not set: {prefix}_SERVER")
+    port = os.getenv(f"{prefix}_PORT")
+    if port:
+        parsed = parse.urlparse(server)
+        server = parsed._replace(netloc=f"{parsed.hostname}:{port}").geturl()
+    return AlgoClientConfig(server, os.getenv(f"{prefix}_TOKEN", ""))
+
+
+def get_deploy_targets() -> list[DeployTarget]:
+    """Reads the networks listed in the comma separated `DEPLOY_TARGETS` variable."""
+    names = [
+        name.strip().upper()
+        for name in os.getenv("DEPLOY_TARGETS", "").split(",")
+        if name.strip()
+    ]
+    return [
+        DeployTarget(
+            name=name,
+            algod_config=_config_from_environment(f"{name}_ALGOD"),
+            indexer_config=_config_from_environment(f"{name}_INDEXER"),
+            deployer_name=f"{name}_DEPLOYER",
+            kmd_port=os.getenv(f"{name}_KMD_PORT"),
+        )
+        for name in names
+    ]
+
+
+def _deploy_with_clients(
+    algod_client: AlgodClient,
+    indexer_client: IndexerClient,
+    app_spec: ApplicationSpecification,
+    deploy_callback: DeployCallback,
+    deployer_name: str,
+    deployer_initial_funds: int,
+    kmd_client: KMDClient | None = None,
+) -> None:
     # get deployer account by name
-    deployer = get_account(algod_client, "DEPLOYER", fund_with_algos=0)
+    deployer = get_account(
+        algod_client, deployer_name, fund_with_algos=0, kmd_client=kmd_client
+    )
 
     minimum_funds_micro_algos = algos_to_microalgos(deployer_initial_funds)
     ensure_funded(
@@ -43,8 +116,94 @@ def deploy(
             account_to_fund=deployer,
             min_spending_balance_micro_algos=minimum_funds_micro_algos,
             min_funding_increment_micro_algos=minimum_funds_micro_algos,
+            funding_source=_localnet_dispenser(algod_client, kmd_client),
         ),
     )
 
     # use provided callback to deploy the app
     deploy_callback(algod_client, indexer_client, app_spec, deployer)
+
+
+def _localnet_dispenser(
+    algod_client: AlgodClient, kmd_client: KMDClient | None
+) -> Account | None:
+    """Returns the default LocalNet account of `kmd_client`, if one is given."""
+    if kmd_client is None or not is_localnet(algod_client):
+        return None
+    return get_kmd_wallet_account(
+        algod_client,
+        kmd_client,
+        "unencrypted-default-wallet",
+        lambda account: account["status"] != "Offline"
+        and account["amount"] > LOCALNET_DISPENSER_MIN_BALANCE,
+    )
+
+
+def deploy(
+    app_spec_path: Path,
+    deploy_callback: DeployCallback,
+    deployer_initial_funds: int = 2,
+) -> None:
+    # get clients
+    # by default client configuration is loaded from environment variables
+    algod_client = get_algod_client()
+    indexer_client = get_indexer_client()
+
+    # get app spec
+    app_spec = ApplicationSpecification.from_json(app_spec_path.read_text())
+
+    _deploy_with_clients(
+        algod_client,
+        indexer_client,
+        app_spec,
+        deploy_callback,
+        "DEPLOYER",
+        deployer_initial_funds,
+    )
+
+
+def deploy_to_targets(
+    app_spec_path: Path,
+    deploy_callback: DeployCallback,
+    targets: list[DeployTarget],
+    deployer_initial_funds: int = 2,
+) -> list[DeployResult]:
+    """Deploys the same app spec to every target concurrently.
+
+    The callback runs once per network with that network's clients, so policies
+    such as `is_mainnet` are still decided per target. A failing target does not
+    stop the others; its error is reported in the returned results.
+    """
+    app_spec = ApplicationSpecification.from_json(app_spec_path.read_text())
+
+    def deploy_target(target: DeployTarget) -> DeployResult:
+        start = time.monotonic()
+        try:
+            _deploy_with_clients(
+                get_algod_client(target.algod_config),
+                get_indexer_client(target.indexer_config),
+                copy.deepcopy(app_spec),
+                deploy_callback,
+                target.deployer_name,
+                deployer_initial_funds,
+                target.kmd_client(),
+            )
+        except Exception as e:
+            logger.exception(f"Deploying to {target.name} failed")
+            return DeployResult(
+                target.name,
+                succeeded=False,
+                seconds=time.monotonic() - start,
+                error=str(e),
+            )
+        return DeployResult(
+            target.name, succeeded=True, seconds=time.monotonic() - start
+        )
+
+    with ThreadPoolExecutor(max_workers=max(len(targets), 1)) as executor:
+        results = list(executor.map(deploy_target, targets))
+
+    for result in results:
+        status = "ok" if result.succeeded else f"failed: {result.error}"
+        logger.info(f"{result.target}: {status} ({result.seconds:.1f}s)")
+    return results
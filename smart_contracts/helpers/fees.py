@@ -0,0 +1,168 @@
+import dataclasses
+import hashlib
+import logging
+import math
+import threading
+from copy import copy
+
+from algokit_utils import ApplicationClient, TransactionParameters
+from algokit_utils.models import ABIMethod
+from algosdk import constants, transaction
+from algosdk.abi import Method
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+
+from smart_contracts.helpers.simulate import simulate_atc
+
+logger = logging.getLogger(__name__)
+
+# Fee usage is reported by simulate in millionths of the minimum fee.
+USAGE_SCALE = 1_000_000
+# Number of inner transactions the probe call pays for while being simulated.
+PROBE_INNER_TXNS = 16
+
+
+def method_signature(method: ABIMethod) -> str:
+    """Returns the ABI signature (or name, if given as such) of a method."""
+    match method:
+        case str():
+            return method
+        case Method():
+            return method.get_signature()
+        case _:
+            return method.method_spec().get_signature()
+
+
+def min_fee(sp: transaction.SuggestedParams) -> int:
+    """Returns the minimum fee of a transaction built from the suggested params."""
+    return sp.min_fee or constants.MIN_TXN_FEE
+
+
+def count_inner_txns(txn_result: dict) -> int:
+    """Counts the inner transactions issued by a transaction, recursively."""
+    inner_txns = txn_result.get("inner-txns", [])
+    return len(inner_txns) + sum(count_inner_txns(inner) for inner in inner_txns)
+
+
+class FeeEstimator:
+    """Sets the minimal flat fee of app calls that issue inner transactions.
+
+    The fee usage of each method is measured once by simulating the call and is
+    cached per approval program, method signature and number of referenced
+    accounts, so apps running the same program share their estimates through
+    `for_client`.
+    """
+
+    def __init__(
+        self, app_client: ApplicationClient, probe_inner_txns: int = PROBE_INNER_TXNS
+    ) -> None:
+        self.app_client = app_client
+        self.probe_inner_txns = probe_inner_txns
+        self._usage: dict[tuple[str, str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def for_client(self, app_client: ApplicationClient) -> "FeeEstimator":
+        """Returns an estimator of another client sharing the cached estimates."""
+        estimator = FeeEstimator(app_client, self.probe_inner_txns)
+        estimator._usage = self._usage
+        estimator._lock = self._lock
+        return estimator
+
+    def app_version(self) -> str:
+        """Identifies the program currently used by the client."""
+        if self.app_client.approval is not None:
+            return self.app_client.approval.binary_hash
+        return hashlib.sha256(
+            self.app_client.app_spec.approval_program.encode()
+        ).hexdigest()
+
+    def suggested_params(
+        self,
+        call_abi_method: ABIMethod,
+        transaction_parameters: TransactionParameters | None = None,
+        *,
+        on_complete: transaction.OnComplete = transaction.OnComplete.NoOpOC,
+        **abi_kwargs: object,
+    ) -> transaction.SuggestedParams:
+        """Returns suggested params with the minimal flat fee for the call."""
+        parameters = transaction_parameters or TransactionParameters()
+        sp = copy(
+            parameters.suggested_params
+            or self.app_client.suggested_params
+            or self.app_client.algod_client.suggested_params()
+        )
+        # Calls like `reclaim` issue inner transactions per referenced account.
+        key = (
+            self.app_version(),
+            method_signature(call_abi_method),
+            len(parameters.accounts or []),
+        )
+        # Concurrent callers, like shards being deployed, simulate a call once.
+        with self._lock:
+            if key not in self._usage:
+                self._usage[key] = self._simulate_usage(
+                    call_abi_method, parameters, sp, on_complete, abi_kwargs
+                )
+                logger.debug(
+                    f"Fee usage of {key[1]} with {key[2]} accounts: "
+                    f"{self._usage[key]}"
+                )
+
+        sp.flat_fee = True
+        sp.fee = math.ceil(self._usage[key] * min_fee(sp) / USAGE_SCALE)
+        return sp
+
+    def with_fee(
+        self,
+        call_abi_method: ABIMethod,
+        transaction_parameters: TransactionParameters | None = None,
+        *,
+        on_complete: transaction.OnComplete = transaction.OnComplete.NoOpOC,
+        **abi_kwargs: object,
+    ) -> TransactionParameters:
+        """Returns a copy of the transaction parameters with the minimal fee set."""
+        parameters = transaction_parameters or TransactionParameters()
+        return dataclasses.replace(
+            parameters,
+            suggested_params=self.suggested_params(
+                call_abi_method, parameters, on_complete=on_complete, **abi_kwargs
+            ),
+        )
+
+    def invalidate(self) -> None:
+        """Forgets every cached estimate."""
+        with self._lock:
+            self._usage.clear()
+
+    def _simulate_usage(
+        self,
+        call_abi_method: ABIMethod,
+        parameters: TransactionParameters,
+        sp: transaction.SuggestedParams,
+        on_complete: transaction.OnComplete,
+        abi_kwargs: dict[str, object],
+    ) -> int:
+        # The probe has to carry enough fee for its inner transactions,
+        # otherwise the simulation fails before reporting them.
+        probe_sp = copy(sp)
+        probe_sp.flat_fee = True
+        probe_sp.fee = min_fee(sp) * (1 + self.probe_inner_txns)
+
+        atc = AtomicTransactionComposer()
+        self.app_client.add_method_call(
+            atc,
+            call_abi_method,
+            abi_args=abi_kwargs,
+            parameters=dataclasses.replace(parameters, suggested_params=probe_sp),
+            on_complete=on_complete,
+        )
+        txn_group = simulate_atc(self.app_client.algod_client, atc)
+        if txn_group.get("failure-message"):
+            raise Exception(
+                f"Simulate failed for {method_signature(call_abi_method)}: "
+                f"{txn_group['failure-message']}"
+            )
+
+        if txn_group.get("group-usage") is not None:
+            return int(txn_group["group-usage"])
+        inner_txns = count_inner_txns(txn_group["txn-results"][0]["txn-result"])
+        return (1 + inner_txns) * USAGE_SCALE
@@ -0,0 +1,153 @@
+import base64
+import dataclasses
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from algosdk import abi
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+from smart_contracts.helpers.tally import Tally
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".tally_cache")
+VOTE_METHOD = abi.Method.from_signature("vote(bool,asset)void")
+# ABI encoding of a true `bool` argument.
+ABI_TRUE = b"\x80"
+
+
+@dataclasses.dataclass
+class VoteState:
+    """Votes of an app as of the end of `round`, keyed by voter address."""
+
+    round: int
+    votes: dict[str, bool] = dataclasses.field(default_factory=dict)
+
+    @property
+    def tally(self) -> Tally:
+        return Tally(len(self.votes), sum(self.votes.values()))
+
+
+def _app_calls(txn: dict, app_id: int) -> Iterator[dict]:
+    """Yields the calls to the app in a transaction tree, in execution order."""
+    if txn.get("application-transaction", {}).get("application-id") == app_id:
+        yield txn
+    for inner in txn.get("inner-txns", []):
+        yield from _app_calls(inner, app_id)
+
+
+def apply_call(votes: dict[str, bool], txn: dict, vote_selector: bytes) -> None:
+    """Applies a confirmed app call to the votes, as the contract does."""
+    call = txn["application-transaction"]
+    match call["on-completion"]:
+        case "closeout" | "clear":
+            votes.pop(txn["sender"], None)
+        case "noop":
+            args = [base64.b64decode(arg) for arg in call.get("application-args", [])]
+            if args and args[0] == vote_selector:
+                votes[txn["sender"]] = args[1] == ABI_TRUE
+
+
+class TallyHistory:
+    """Tallies of an app at past rounds, rebuilt from its indexer history.
+
+    Every rebuilt state at a round the indexer has already reached is stored on
+    disk as a checkpoint, so a later query only replays the transactions between
+    the nearest earlier checkpoint and its round.
+    """
+
+    def __init__(
+        self,
+        algod_client: AlgodClient,
+        indexer_client: IndexerClient,
+        app_id: int,
+        cache_path: Path | None = None,
+        vote_method: abi.Method = VOTE_METHOD,
+        page_size: int = 1_000,
+    ) -> None:
+        self.indexer_client = indexer_client
+        self.app_id = app_id
+        self.vote_selector = vote_method.get_selector()
+        self.page_size = page_size
+        network = base64.urlsafe_b64encode(
+            base64.b64decode(algod_client.suggested_params().gh)
+        ).decode("ascii")
+        self.path = (
+            (cache_path or Path(os.getenv("TALLY_CACHE_PATH", DEFAULT_CACHE_PATH)))
+            / network.rstrip("=")
+            / str(app_id)
+        )
+
+    def state_at(self, round_: int) -> VoteState:
+        """Returns the votes as of the end of `round_`."""
+        state = self._nearest_checkpoint(round_)
+        if state.round < round_:
+            self._replay(state, round_)
+        return state
+
+    def tally_at(self, round_: int) -> Tally:
+        return self.state_at(round_).tally
+
+    def turnout(self, rounds: Iterable[int]) -> list[tuple[int, Tally]]:
+        """Returns the tally at each round, each replayed from the one before."""
+        points = []
+        state: VoteState | None = None
+        for round_ in sorted(set(rounds)):
+            if state is None:
+                state = self.state_at(round_)
+            else:
+                self._replay(state, round_)
+            points.append((round_, state.tally))
+        return points
+
+    def _replay(self, state: VoteState, round_: int) -> None:
+        logger.debug(
+            f"Replaying app {self.app_id} from round {state.round + 1} to {round_}"
+        )
+        indexed_round = 0
+        for page in self._pages(state.round + 1, round_):
+            indexed_round = page["current-round"]
+            for txn in page["transactions"]:
+                for call in _app_calls(txn, self.app_id):
+                    apply_call(state.votes, call, self.vote_selector)
+        state.round = round_
+        # Rounds the indexer has not reached yet may still gain transactions.
+        if round_ <= indexed_round:
+            self._save(state)
+
+    def _pages(self, min_round: int, max_round: int) -> Iterator[dict]:
+        """Pages through the app's transactions in the rounds, oldest first."""
+        next_page = None
+        while True:
+            response = self.indexer_client.search_transactions(
+                application_id=self.app_id,
+                min_round=min_round,
+                max_round=max_round,
+                limit=self.page_size,
+                next_page=next_page,
+            )
+            yield response
+            next_page = response.get("next-token")
+            if not next_page or not response["transactions"]:
+                return
+
+    def _nearest_checkpoint(self, round_: int) -> VoteState:
+        rounds = [int(path.stem) for path in self.path.glob("*.json")]
+        earlier = [r for r in rounds if r <= round_]
+        if not earlier:
+            return VoteState(round=0)
+        checkpoint = json.loads((self.path / f"{max(earlier)}.json").read_text())
+        return VoteState(checkpoint["round"], checkpoint["votes"])
+
+    def _save(self, state: VoteState) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path, delete=False, suffix=".tmp"
+        ) as file:
+            json.dump(dataclasses.asdict(state), file)
+        os.replace(file.name, self.path / f"{state.round}.json")
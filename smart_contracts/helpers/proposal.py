@@ -0,0 +1,128 @@
+import base64
+import hashlib
+import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from typing import cast
+
+from algokit_utils import ApplicationClient, OnCompleteCallParameters
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+
+logger = logging.getLogger(__name__)
+
+# Largest chunk that fits the app args of a `put_proposal_chunk` call, next to the
+# selector, the index and the length prefix of the data.
+CHUNK_SIZE = 2_000
+# Minimum balance of a box, and of each byte of its name and value, in microAlgos.
+BOX_FLAT_MIN_BALANCE = 2_500
+BOX_BYTE_MIN_BALANCE = 400
+
+
+def box_name(index: int) -> bytes:
+    return index.to_bytes(8, "big")
+
+
+def encode_document(document: str, *, compress: bool) -> bytes:
+    data = document.encode("utf-8")
+    return zlib.compress(data, level=9) if compress else data
+
+
+def split_chunks(data: bytes) -> list[bytes]:
+    return [data[i : i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+
+def document_min_balance(data: bytes) -> int:
+    """Returns the minimum balance the app needs to store `data` in boxes."""
+    chunks = split_chunks(data)
+    return sum(
+        BOX_FLAT_MIN_BALANCE + BOX_BYTE_MIN_BALANCE * (8 + len(chunk))
+        for chunk in chunks
+    )
+
+
+def upload_proposal_document(
+    app_client: ApplicationClient, document: str, *, compress: bool = True
+) -> bytes:
+    """Stores a proposal document in boxes of the app, returning its content hash.
+
+    The app account must already hold `document_min_balance` for the boxes. Chunk
+    uploads are packed into full groups that are submitted concurrently.
+    """
+    data = encode_document(document, compress=compress)
+    chunks = split_chunks(data)
+    content_hash = hashlib.sha256(data).digest()
+    app_client.call(
+        "set_proposal_document",
+        content_hash=content_hash,
+        chunks=len(chunks),
+        compressed=compress,
+    )
+
+    sp = app_client.algod_client.suggested_params()
+    group_size = AtomicTransactionComposer.MAX_GROUP_SIZE
+    atcs = []
+    for start in range(0, len(chunks), group_size):
+        atc = AtomicTransactionComposer()
+        for index in range(start, min(start + group_size, len(chunks))):
+            app_client.compose_call(
+                atc,
+                "put_proposal_chunk",
+                OnCompleteCallParameters(
+                    suggested_params=copy(sp),
+                    # Each box reference grants 1KB of box I/O, a chunk needs two.
+                    boxes=[(0, box_name(index)), (0, b"")],
+                ),
+                index=index,
+                data=chunks[index],
+            )
+        atcs.append(atc)
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(app_client.execute_atc, atcs))
+
+    logger.info(
+        f"Uploaded proposal document of {len(data)} bytes in {len(chunks)} chunks "
+        f"to app {app_client.app_id}"
+    )
+    return content_hash
+
+
+class ProposalDocument:
+    """Proposal document of an app, read from its boxes on demand.
+
+    Only the content hash and chunk count are read up front; chunks are fetched
+    when first needed, in parallel, and the whole content is checked against the
+    hash before it is returned.
+    """
+
+    def __init__(self, app_client: ApplicationClient, max_workers: int = 8) -> None:
+        self.app_client = app_client
+        self.max_workers = max_workers
+        state = app_client.get_global_state(raw=True)
+        if b"proposal_hash" not in state:
+            raise Exception(f"App {app_client.app_id} has no proposal document")
+        self.content_hash = cast(bytes, state[b"proposal_hash"])
+        self.chunks = cast(int, state[b"proposal_chunks"])
+        self.compressed = bool(state[b"proposal_compressed"])
+        self._chunks: dict[int, bytes] = {}
+
+    def chunk(self, index: int) -> bytes:
+        if index not in self._chunks:
+            response = cast(
+                dict,
+                self.app_client.algod_client.application_box_by_name(
+                    self.app_client.app_id, box_name(index)
+                ),
+            )
+            self._chunks[index] = base64.b64decode(response["value"])
+        return self._chunks[index]
+
+    def read(self) -> str:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            data = b"".join(executor.map(self.chunk, range(self.chunks)))
+        if hashlib.sha256(data).digest() != self.content_hash:
+            raise Exception(
+                f"Proposal document of app {self.app_client.app_id} "
+                "does not match its content hash"
+            )
+        return (zlib.decompress(data) if self.compressed else data).decode("utf-8")
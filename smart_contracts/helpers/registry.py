@@ -0,0 +1,146 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import cast
+
+from algokit_utils import (
+    AppDeployMetaData,
+    AppLookup,
+    AppMetaData,
+    get_creator_apps,
+)
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_VERSION = 3
+DEFAULT_REGISTRY_PATH = Path(".app_registry.json")
+
+
+def _metadata_from_dict(value: dict) -> AppMetaData:
+    return AppMetaData(
+        **{
+            **value,
+            "created_metadata": AppDeployMetaData(**value["created_metadata"]),
+        }
+    )
+
+
+def _created_app_count(algod_client: AlgodClient, creator: str) -> int:
+    account = cast(dict, algod_client.account_info(creator, exclude="all"))
+    return int(account.get("total-created-apps", 0))
+
+
+def _approval_hash(algod_client: AlgodClient, creator: str, app_id: int) -> str | None:
+    """Returns the hash of the app's approval program, if the creator still has it."""
+    try:
+        params = cast(dict, algod_client.application_info(app_id))["params"]
+    except AlgodHTTPError:
+        return None
+    if params["creator"] != creator:
+        return None
+    return hashlib.sha256(params["approval-program"].encode()).hexdigest()
+
+
+class AppRegistry:
+    """Local record of deployed app ids, per network, creator and app name.
+
+    Lets deployments skip the indexer scan over every app the creator made. A
+    recorded app is confirmed with two small algod lookups, whatever the number
+    of apps the creator has: the creator must have as many apps as when it was
+    recorded, and the app must still exist with the same approval program.
+    Anything else, including an app updated or appended from another machine,
+    falls back to `get_creator_apps`.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or Path(os.getenv("APP_REGISTRY_PATH", DEFAULT_REGISTRY_PATH))
+
+    def lookup(
+        self,
+        algod_client: AlgodClient,
+        indexer_client: IndexerClient,
+        creator: str,
+        app_name: str,
+    ) -> AppLookup:
+        """Returns the creator's apps, from the registry when `app_name` is current."""
+        network = _network(algod_client)
+        with self._lock:
+            recorded = self._read().get(network, {}).get(creator)
+        if recorded is not None and app_name in recorded["apps"]:
+            if _is_current(algod_client, creator, recorded, app_name):
+                return AppLookup(
+                    creator,
+                    {
+                        name: _metadata_from_dict(entry["metadata"])
+                        for name, entry in recorded["apps"].items()
+                    },
+                )
+            logger.info(f"Recorded apps of {creator} for {app_name} are stale")
+
+        logger.info(f"Looking up apps created by {creator} on the indexer")
+        return get_creator_apps(indexer_client, creator)
+
+    def record(self, algod_client: AlgodClient, lookup: AppLookup) -> None:
+        """Stores the apps of a lookup, replacing the file atomically."""
+        network = _network(algod_client)
+        created_apps = _created_app_count(algod_client, lookup.creator)
+        apps = {
+            name: {
+                "metadata": dataclasses.asdict(app),
+                "approval_hash": (
+                    None
+                    if app.deleted
+                    else _approval_hash(algod_client, lookup.creator, app.app_id)
+                ),
+            }
+            for name, app in lookup.apps.items()
+        }
+        with self._lock:
+            networks = self._read()
+            networks.setdefault(network, {})[lookup.creator] = {
+                "created_apps": created_apps,
+                "apps": apps,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, delete=False, suffix=".tmp"
+            ) as file:
+                json.dump(
+                    {"version": REGISTRY_VERSION, "networks": networks}, file, indent=2
+                )
+            os.replace(file.name, self.path)
+
+    def _read(self) -> dict[str, dict[str, dict]]:
+        try:
+            registry = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if registry.get("version") != REGISTRY_VERSION:
+            return {}
+        return dict(registry["networks"])
+
+
+def _network(algod_client: AlgodClient) -> str:
+    return str(algod_client.suggested_params().gh)
+
+
+def _is_current(
+    algod_client: AlgodClient, creator: str, recorded: dict, app_name: str
+) -> bool:
+    if _created_app_count(algod_client, creator) != recorded["created_apps"]:
+        return False
+    entry = recorded["apps"][app_name]
+    if entry["metadata"]["deleted"]:
+        return True
+    approval_hash = _approval_hash(algod_client, creator, entry["metadata"]["app_id"])
+    return approval_hash is not None and approval_hash == entry["approval_hash"]
@@ -0,0 +1,195 @@
+import base64
+import dataclasses
+import logging
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
+from algokit_utils import (
+    Account,
+    ApplicationClient,
+    ApplicationSpecification,
+    CreateCallParameters,
+    OnCompleteCallParameters,
+    TransferParameters,
+    transfer,
+)
+from algosdk import encoding
+from algosdk.v2client.algod import AlgodClient
+
+from smart_contracts.helpers.fees import FeeEstimator
+from smart_contracts.helpers.tally import Tally
+
+logger = logging.getLogger(__name__)
+
+# Minimum balance of a shard app account holding its registered ASA, plus fee room.
+DEFAULT_SHARD_FUNDING = 200_000
+
+
+def shard_of(address: str, shard_count: int) -> int:
+    """Returns the shard an address votes in, as checked by `register` on chain."""
+    digest = encoding.checksum(encoding.decode_address(address))
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+@dataclasses.dataclass
+class Shard:
+    index: int
+    app_client: ApplicationClient
+    registered_asa_id: int
+
+
+class ShardedDao:
+    """One proposal split across `len(shards)` DAO apps.
+
+    Each voter registers and votes in the shard picked by `shard_of`, so state,
+    minimum balance and inner transactions are spread across apps instead of
+    going through a single pair of global counters. Each shard mints the maximum
+    supply of its registered ASA, so the shard count only bounds throughput, not
+    the number of voters.
+    """
+
+    def __init__(self, shards: list[Shard]) -> None:
+        self.shards = shards
+
+    @classmethod
+    def from_app_ids(
+        cls,
+        algod_client: AlgodClient,
+        app_spec: ApplicationSpecification,
+        app_ids: list[int],
+        signer: Account | None = None,
+    ) -> "ShardedDao":
+        """Loads the shards of a deployed proposal, in shard index order."""
+        shards = []
+        for index, app_id in enumerate(app_ids):
+            app_client = ApplicationClient(
+                algod_client, app_spec, app_id=app_id, signer=signer
+            )
+            state = app_client.get_global_state()
+            shards.append(Shard(index, app_client, int(state["registered_asa_id"])))
+        return cls(shards)
+
+    def shard_for(self, address: str) -> Shard:
+        return self.shards[shard_of(address, len(self.shards))]
+
+    def tally(self, creator: str | None = None, max_workers: int = 8) -> Tally:
+        """Sums the shard tallies after checking the shards belong together.
+
+        Every shard must run the same approval program, hold the same proposal and
+        voting deadline, and know its own index and the shard count, so that a
+        voter can only ever have been counted by one of them. When `creator` is
+        given, each shard must also have been created by it.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            infos = list(
+                executor.map(
+                    lambda shard: cast(
+                        dict,
+                        shard.app_client.algod_client.application_info(
+                            shard.app_client.app_id
+                        ),
+                    )["params"],
+                    self.shards,
+                )
+            )
+
+        expected = _global_state(infos[0])
+        tally = Tally(0, 0)
+        for shard, params in zip(self.shards, infos, strict=True):
+            app_id = shard.app_client.app_id
+            state = _global_state(params)
+            if creator is not None and params["creator"] != creator:
+                raise Exception(f"Shard app {app_id} was not created by {creator}")
+            if params["approval-program"] != infos[0]["approval-program"]:
+                raise Exception(f"Shard app {app_id} runs a different program")
+            if any(
+                state.get(key) != expected.get(key)
+                for key in ("proposal", "end_voting")
+            ):
+                raise Exception(f"Shard app {app_id} is for a different proposal")
+            numbering = (state.get("shard_index"), state.get("shard_count"))
+            if numbering != (shard.index, len(self.shards)):
+                raise Exception(
+                    f"Shard app {app_id} is not shard {shard.index} "
+                    f"of {len(self.shards)}"
+                )
+            tally = Tally(
+                tally.total + cast(int, state.get("votes_total", 0)),
+                tally.in_favor + cast(int, state.get("votes_in_favor", 0)),
+            )
+        return tally
+
+
+def _global_state(params: dict) -> dict[str, int | bytes]:
+    state: dict[str, int | bytes] = {}
+    for entry in params.get("global-state", []):
+        key = base64.b64decode(entry["key"]).decode("utf-8")
+        value = entry["value"]
+        state[key] = (
+            base64.b64decode(value["bytes"]) if value["type"] == 1 else value["uint"]
+        )
+    return state
+
+
+def deploy_shards(
+    algod_client: AlgodClient,
+    app_spec: ApplicationSpecification,
+    creator: Account,
+    proposal: str,
+    end_voting: int,
+    shard_count: int,
+    template_values: Mapping[str, int | str | bytes] | None = None,
+    funding: int = DEFAULT_SHARD_FUNDING,
+    max_workers: int = 8,
+) -> ShardedDao:
+    """Creates, funds, numbers and bootstraps `shard_count` DAO apps concurrently.
+
+    The shards run the same program, so the bootstrap fee is simulated once.
+    """
+    app_clients = [
+        ApplicationClient(
+            algod_client,
+            app_spec,
+            signer=creator,
+            template_values=template_values,
+        )
+        for _ in range(shard_count)
+    ]
+    fee_estimator = FeeEstimator(app_clients[0])
+
+    def deploy_shard(index: int) -> Shard:
+        app_client = app_clients[index]
+        # Shards are otherwise identical create calls, the note keeps txids apart.
+        app_client.create(
+            transaction_parameters=CreateCallParameters(
+                note=f"shard {index}/{shard_count}"
+            ),
+            proposal=proposal,
+            end_voting=end_voting,
+        )
+        transfer(
+            algod_client,
+            TransferParameters(
+                from_account=creator,
+                to_address=app_client.app_address,
+                micro_algos=funding,
+            ),
+        )
+        app_client.call("set_shard", index=index, count=shard_count)
+        registered_asa_id = app_client.call(
+            "bootstrap",
+            transaction_parameters=OnCompleteCallParameters(
+                suggested_params=fee_estimator.for_client(app_client).suggested_params(
+                    "bootstrap"
+                )
+            ),
+        ).return_value
+        return Shard(index, app_client, registered_asa_id)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        shards = list(executor.map(deploy_shard, range(shard_count)))
+    logger.info(
+        f"Deployed {shard_count} shards: {[s.app_client.app_id for s in shards]}"
+    )
+    return ShardedDao(shards)
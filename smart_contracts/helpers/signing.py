@@ -0,0 +1,167 @@
+import logging
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import copy
+
+from algokit_utils import Account
+from algosdk import transaction
+from algosdk.atomic_transaction_composer import (
+    AccountTransactionSigner,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+
+from smart_contracts.helpers.submit import SubmissionScheduler, sign_group
+
+logger = logging.getLogger(__name__)
+
+# Groups sent to a worker per task, enough to amortize the round trip.
+DEFAULT_BATCH_SIZE = 64
+
+# Signers of the worker process, set once by `_init_worker`.
+_worker_signers: dict[str, AccountTransactionSigner] = {}
+
+
+def _init_worker(private_keys: dict[str, str]) -> None:
+    _worker_signers.update(
+        {
+            address: AccountTransactionSigner(private_key)
+            for address, private_key in private_keys.items()
+        }
+    )
+
+
+def _signer_for(sender: str) -> AccountTransactionSigner:
+    if sender not in _worker_signers:
+        raise Exception(f"No signing key for {sender}")
+    return _worker_signers[sender]
+
+
+def _sign_batch(
+    groups: list[list[transaction.Transaction]],
+) -> list[list[transaction.GenericSignedTransaction]]:
+    return [
+        sign_group(
+            [TransactionWithSigner(txn, _signer_for(txn.sender)) for txn in group]
+        )
+        for group in groups
+    ]
+
+
+def _batches(
+    groups: Iterable[Sequence[transaction.Transaction]], size: int
+) -> Iterator[list[list[transaction.Transaction]]]:
+    batch: list[list[transaction.Transaction]] = []
+    for group in groups:
+        batch.append(list(group))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _grouped(txns: Sequence[transaction.Transaction]) -> list[transaction.Transaction]:
+    txns = [copy(txn) for txn in txns]
+    for txn in txns:
+        txn.group = None
+    if len(txns) > 1:
+        transaction.assign_group_id(txns)
+    return txns
+
+
+class PoolSigner(TransactionSigner):
+    """`TransactionSigner` of every account of a `SigningPool`."""
+
+    def __init__(self, pool: "SigningPool") -> None:
+        super().__init__()
+        self.pool = pool
+
+    def sign_transactions(
+        self, txn_group: list[transaction.Transaction], indexes: list[int]
+    ) -> list[transaction.GenericSignedTransaction]:
+        return next(self.pool.sign_groups([[txn_group[i] for i in indexes]]))
+
+
+class SigningPool:
+    """Signs transaction groups with ed25519 across a pool of processes.
+
+    Each worker receives the accounts' keys once, when it starts, so tasks only
+    carry transactions. Groups are signed in batches and streamed back in the
+    order they were given, with at most `max_in_flight` batches outstanding.
+    `signer` plugs the pool into composers and the `SubmissionScheduler`.
+    """
+
+    def __init__(
+        self,
+        accounts: Iterable[Account],
+        max_workers: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_in_flight: int | None = None,
+    ) -> None:
+        max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers,
+            initializer=_init_worker,
+            initargs=({account.address: account.private_key for account in accounts},),
+        )
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight or 2 * max_workers
+        self.signer = PoolSigner(self)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "SigningPool":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def sign_groups(
+        self, groups: Iterable[Sequence[transaction.Transaction]]
+    ) -> Iterator[list[transaction.GenericSignedTransaction]]:
+        """Yields each group signed, in order, as soon as its batch is done."""
+        pending: deque[Future[list[list[transaction.GenericSignedTransaction]]]] = (
+            deque()
+        )
+        for batch in _batches(groups, self.batch_size):
+            pending.append(self._executor.submit(_sign_batch, batch))
+            if len(pending) >= self.max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def submit(
+        self,
+        scheduler: SubmissionScheduler,
+        groups: Iterable[Sequence[transaction.Transaction]],
+        timeout: float | None = None,
+    ) -> list[Future[str]]:
+        """Assigns group ids, signs the groups in the pool and queues them.
+
+        Groups are queued as they come back from the workers, so signing overlaps
+        with submission. The scheduler keeps `signer` to re-sign dead groups.
+        """
+        grouped = (_grouped(txns) for txns in groups)
+        futures = []
+        pending: deque[list[transaction.Transaction]] = deque()
+
+        def unsigned() -> Iterator[list[transaction.Transaction]]:
+            for txns in grouped:
+                pending.append(txns)
+                yield txns
+
+        for signed in self.sign_groups(unsigned()):
+            txns = pending.popleft()
+            futures.append(
+                scheduler.submit(
+                    [TransactionWithSigner(txn, self.signer) for txn in txns],
+                    timeout=timeout,
+                    signed=signed,
+                )
+            )
+        logger.debug(f"Signed and queued {len(futures)} groups")
+        return futures
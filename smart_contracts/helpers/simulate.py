@@ -0,0 +1,47 @@
+import base64
+from collections.abc import Sequence
+from typing import cast
+
+from algosdk import abi, transaction
+from algosdk.atomic_transaction_composer import (
+    ABI_RETURN_HASH,
+    AtomicTransactionComposer,
+    EmptySigner,
+)
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.models import SimulateRequest, SimulateRequestTransactionGroup
+
+
+def simulate_unsigned(
+    algod_client: AlgodClient, txns: Sequence[transaction.Transaction]
+) -> dict:
+    """Simulates a group of unsigned transactions and returns its result."""
+    request = SimulateRequest(
+        txn_groups=[
+            SimulateRequestTransactionGroup(
+                txns=EmptySigner().sign_transactions(list(txns), list(range(len(txns))))
+            )
+        ],
+        allow_empty_signatures=True,
+    )
+    response = cast(dict, algod_client.simulate_transactions(request))
+    return cast(dict, response["txn-groups"][0])
+
+
+def simulate_atc(algod_client: AlgodClient, atc: AtomicTransactionComposer) -> dict:
+    """Simulates the group of a composer without signing it."""
+    return simulate_unsigned(
+        algod_client, [txn_with_signer.txn for txn_with_signer in atc.build_group()]
+    )
+
+
+def decode_return(method: abi.Method, txn_result: dict) -> object:
+    """Decodes the ABI return value logged by a simulated method call."""
+    return_type = method.returns.type
+    if isinstance(return_type, str):
+        raise Exception(f"{method.get_signature()} does not return a value")
+    for log in reversed(txn_result.get("logs", [])):
+        raw = base64.b64decode(log)
+        if raw.startswith(ABI_RETURN_HASH):
+            return return_type.decode(raw[len(ABI_RETURN_HASH) :])
+    raise Exception(f"No return value logged by {method.get_signature()}")
@@ -0,0 +1,298 @@
+import dataclasses
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from copy import copy
+
+from algosdk import transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+logger = logging.getLogger(__name__)
+
+# Fragments of the algod error messages the scheduler reacts to.
+POOL_FULL = "transaction pool is full"
+OVERSPEND = "overspend"
+TXN_DEAD = "txn dead"
+ALREADY_IN_LEDGER = "transaction already in ledger"
+
+
+@dataclasses.dataclass
+class SchedulerMetrics:
+    queue_depth: int = 0
+    submitted: int = 0
+    retries: int = 0
+    resigned: int = 0
+    failed: int = 0
+    rate: float = 0.0
+
+
+@dataclasses.dataclass
+class _Submission:
+    txns: list[TransactionWithSigner]
+    future: Future[str]
+    signed: list[transaction.GenericSignedTransaction] | None = None
+    attempts: int = 0
+    # Every txid the group was registered under, one more per re-signing.
+    keys: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def txid(self) -> str:
+        return self.txns[0].txn.get_txid()
+
+
+def _regroup(txns: Sequence[TransactionWithSigner]) -> None:
+    for txn_with_signer in txns:
+        txn_with_signer.txn.group = None
+    if len(txns) > 1:
+        transaction.assign_group_id([t.txn for t in txns])
+
+
+def sign_group(
+    txns: Sequence[TransactionWithSigner],
+) -> list[transaction.GenericSignedTransaction]:
+    """Signs a transaction group, calling each signer once for its transactions."""
+    indexes: dict[TransactionSigner, list[int]] = {}
+    for i, txn_with_signer in enumerate(txns):
+        indexes.setdefault(txn_with_signer.signer, []).append(i)
+
+    unsigned = [txn_with_signer.txn for txn_with_signer in txns]
+    signed: list[transaction.GenericSignedTransaction | None] = [None] * len(txns)
+    for signer, signer_indexes in indexes.items():
+        for i, stxn in zip(
+            signer_indexes,
+            signer.sign_transactions(unsigned, signer_indexes),
+            strict=True,
+        ):
+            signed[i] = stxn
+    return [stxn for stxn in signed if stxn is not None]
+
+
+class SubmissionScheduler:
+    """Submits transaction groups to algod from a bounded queue.
+
+    The submission rate adapts to the node: it is cut whenever algod reports a full
+    transaction pool or an overspend and grows back on every accepted group. Groups
+    whose validity window expired are moved to the current rounds and re-signed.
+    Each group is keyed by the id of its first transaction, so submitting it twice
+    returns the same future and a retry never resends a group algod already has.
+    Groups are forgotten once accepted or failed; the last `completed_size`
+    accepted txids keep their future, so resubmitting one still resolves to it.
+    """
+
+    def __init__(
+        self,
+        algod_client: AlgodClient,
+        *,
+        max_queue_size: int = 1_000,
+        rate: float = 50.0,
+        min_rate: float = 1.0,
+        max_rate: float = 1_000.0,
+        rate_increase: float = 1.0,
+        backoff_factor: float = 0.5,
+        max_retries: int = 10,
+        validity_rounds: int = 1_000,
+        completed_size: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.algod_client = algod_client
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_increase = rate_increase
+        self.backoff_factor = backoff_factor
+        self.max_retries = max_retries
+        self.validity_rounds = validity_rounds
+        self.completed_size = completed_size
+        self._clock = clock
+        self._sleep = sleep
+        self._queue: queue.Queue[_Submission] = queue.Queue(maxsize=max_queue_size)
+        self._submissions: dict[str, _Submission] = {}
+        # Futures of the most recently accepted groups, by each of their txids.
+        self._completed: OrderedDict[str, Future[str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = SchedulerMetrics(rate=rate)
+        self._next_send = 0.0
+        self._stopping = threading.Event()
+        self._worker: threading.Thread | None = None
+
+    @property
+    def metrics(self) -> SchedulerMetrics:
+        with self._lock:
+            return dataclasses.replace(self._metrics, queue_depth=self._queue.qsize())
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._stopping.clear()
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        """Stops the scheduler once every queued group has been handled.
+
+        Without a running worker nothing can drain the queue, so groups queued
+        before `start` are left there for the next one.
+        """
+        if self._worker is None:
+            return
+        self._queue.join()
+        self._stopping.set()
+        self._worker.join()
+        self._worker = None
+
+    def __enter__(self) -> "SubmissionScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def submit(
+        self,
+        txns: Sequence[TransactionWithSigner],
+        timeout: float | None = None,
+        signed: Sequence[transaction.GenericSignedTransaction] | None = None,
+    ) -> Future[str]:
+        """Queues a transaction group, blocking while the queue is full.
+
+        The returned future resolves to the id of the first transaction once algod
+        accepted the group. A group signed ahead of time is passed as `signed`; the
+        signers are then only used if the group has to be re-signed.
+        """
+        txns = [TransactionWithSigner(copy(t.txn), t.signer) for t in txns]
+        _regroup(txns)
+        submission = _Submission(
+            txns=txns, future=Future(), signed=list(signed) if signed else None
+        )
+        with self._lock:
+            if submission.txid in self._completed:
+                return self._completed[submission.txid]
+            existing = self._submissions.get(submission.txid)
+            if existing is not None:
+                return existing.future
+            submission.keys.append(submission.txid)
+            self._submissions[submission.txid] = submission
+        try:
+            self._queue.put(submission, timeout=timeout)
+        except queue.Full as e:
+            self._evict(submission)
+            submission.future.set_exception(e)
+            raise
+        return submission.future
+
+    def submit_atc(
+        self, atc: AtomicTransactionComposer, timeout: float | None = None
+    ) -> Future[str]:
+        """Queues the transactions of a composer, see `submit`."""
+        return self.submit(atc.build_group(), timeout=timeout)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                submission = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self._dispatch(submission)
+            except Exception as e:
+                self._fail(submission, e)
+            finally:
+                self._queue.task_done()
+
+    def _dispatch(self, submission: _Submission) -> None:
+        while True:
+            self._throttle()
+            try:
+                if submission.signed is None:
+                    submission.signed = sign_group(submission.txns)
+                self.algod_client.send_transactions(submission.signed)
+            except AlgodHTTPError as e:
+                message = str(e)
+                if ALREADY_IN_LEDGER in message:
+                    break
+                if TXN_DEAD in message:
+                    # A group that expired after being accepted must not run twice.
+                    if self._is_known(submission.txid):
+                        break
+                    self._resign(submission)
+                elif POOL_FULL in message or OVERSPEND in message:
+                    self._slow_down()
+                else:
+                    raise
+                if submission.attempts >= self.max_retries:
+                    raise
+                submission.attempts += 1
+                with self._lock:
+                    self._metrics.retries += 1
+                logger.debug(f"Retrying {submission.txid}: {message}")
+                continue
+            break
+
+        with self._lock:
+            self._metrics.submitted += 1
+            self._metrics.rate = min(
+                self.max_rate, self._metrics.rate + self.rate_increase
+            )
+            for key in submission.keys:
+                self._completed[key] = submission.future
+            while len(self._completed) > self.completed_size:
+                self._completed.popitem(last=False)
+        submission.future.set_result(submission.txid)
+        self._evict(submission)
+
+    def _fail(self, submission: _Submission, error: Exception) -> None:
+        logger.warning(f"Submission of {submission.txid} failed: {error}")
+        with self._lock:
+            self._metrics.failed += 1
+        self._evict(submission)
+        submission.future.set_exception(error)
+
+    def _evict(self, submission: _Submission) -> None:
+        with self._lock:
+            for key in submission.keys:
+                if self._submissions.get(key) is submission:
+                    del self._submissions[key]
+
+    def _throttle(self) -> None:
+        now = self._clock()
+        if now < self._next_send:
+            self._sleep(self._next_send - now)
+            now = self._next_send
+        with self._lock:
+            self._next_send = now + 1 / self._metrics.rate
+
+    def _slow_down(self) -> None:
+        with self._lock:
+            self._metrics.rate = max(
+                self.min_rate, self._metrics.rate * self.backoff_factor
+            )
+
+    def _resign(self, submission: _Submission) -> None:
+        sp = self.algod_client.suggested_params()
+        for txn_with_signer in submission.txns:
+            txn_with_signer.txn.first_valid_round = sp.first
+            txn_with_signer.txn.last_valid_round = sp.first + self.validity_rounds
+        _regroup(submission.txns)
+        submission.signed = None
+
+        with self._lock:
+            # Keep the group reachable under its original key as well as the new one.
+            submission.keys.append(submission.txid)
+            self._submissions[submission.txid] = submission
+            self._metrics.resigned += 1
+
+    def _is_known(self, txid: str) -> bool:
+        try:
+            self.algod_client.pending_transaction_info(txid)
+        except AlgodHTTPError:
+            return False
+        return True
@@ -0,0 +1,105 @@
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+
+from algokit_utils import ApplicationClient, OnCompleteCallParameters
+from algosdk import transaction
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+from algosdk.v2client.indexer import IndexerClient
+
+from smart_contracts.helpers.fees import min_fee
+from smart_contracts.helpers.submit import SubmissionScheduler
+
+logger = logging.getLogger(__name__)
+
+# Accounts a single app call can reference.
+MAX_ACCOUNTS_PER_CALL = 4
+
+
+def registered_holders(
+    indexer_client: IndexerClient, asset_id: int, exclude: str, page_size: int = 1_000
+) -> Iterator[str]:
+    """Pages through the accounts holding a positive balance of the asset."""
+    next_page = None
+    while True:
+        response = indexer_client.asset_balances(
+            asset_id, limit=page_size, next_page=next_page, min_balance=0
+        )
+        for balance in response["balances"]:
+            if balance["address"] != exclude and balance["amount"] > 0:
+                yield balance["address"]
+        next_page = response.get("next-token")
+        if not next_page:
+            return
+
+
+def reclaim_params(
+    sp: transaction.SuggestedParams, accounts: int
+) -> transaction.SuggestedParams:
+    """Returns `sp` with the fee of a `reclaim` call referencing `accounts` holders.
+
+    The call claws back at most once per referenced holder.
+    """
+    sp = copy(sp)
+    sp.flat_fee = True
+    sp.fee = min_fee(sp) * (1 + accounts)
+    return sp
+
+
+def _chunks(holders: Iterator[str], size: int) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    for holder in holders:
+        chunk.append(holder)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sweep(
+    app_client: ApplicationClient,
+    indexer_client: IndexerClient,
+    registered_asa_id: int,
+    scheduler: SubmissionScheduler,
+    wait_rounds: int = 10,
+) -> int:
+    """Claws the registered ASA back from every holder once voting has ended.
+
+    Holders are paged from the indexer and packed into full groups of `reclaim`
+    calls, each referencing as many holders as a call can. Groups are queued on
+    `scheduler` as they are built and confirmed concurrently at the end.
+    Returns the number of holders swept.
+    """
+    sp = app_client.algod_client.suggested_params()
+    group_size = AtomicTransactionComposer.MAX_GROUP_SIZE
+    holders = registered_holders(
+        indexer_client, registered_asa_id, exclude=app_client.app_address
+    )
+    futures = []
+    swept = 0
+    for group in _chunks(holders, MAX_ACCOUNTS_PER_CALL * group_size):
+        atc = AtomicTransactionComposer()
+        for accounts in _chunks(iter(group), MAX_ACCOUNTS_PER_CALL):
+            app_client.compose_call(
+                atc,
+                "reclaim",
+                OnCompleteCallParameters(
+                    accounts=accounts,
+                    suggested_params=reclaim_params(sp, len(accounts)),
+                ),
+                registered_asa=registered_asa_id,
+            )
+        futures.append(scheduler.submit_atc(atc))
+        swept += len(group)
+
+    def confirm(txid: str) -> None:
+        transaction.wait_for_confirmation(app_client.algod_client, txid, wait_rounds)
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda future: confirm(future.result()), futures))
+    logger.info(
+        f"Swept {swept} holders of {registered_asa_id} in {len(futures)} groups"
+    )
+    return swept
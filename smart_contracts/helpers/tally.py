@@ -0,0 +1,9 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True)
+class Tally:
+    """Vote counts of a proposal, as returned by `get_votes`."""
+
+    total: int
+    in_favor: int
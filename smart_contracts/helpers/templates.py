@@ -0,0 +1,124 @@
+import copy
+from collections.abc import Hashable
+from typing import cast
+
+from algokit_utils import ApplicationClient, OnCompleteCallParameters
+from algokit_utils.models import ABIMethod
+from algosdk import abi, transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    EmptySigner,
+    TransactionSigner,
+    TransactionWithSigner,
+)
+
+
+class CallTemplate:
+    """An app call composed once and patched per sender.
+
+    The method selector, foreign arrays, fee and encoded arguments are built by
+    `compose_call` when the template is made. Each `build` copies that
+    transaction and only sets the sender, the validity rounds and, when the
+    template has one, the encoding of its `variable` argument, which is cached
+    per value.
+    """
+
+    def __init__(
+        self,
+        app_client: ApplicationClient,
+        call_abi_method: ABIMethod,
+        sp: transaction.SuggestedParams,
+        *,
+        on_complete: transaction.OnComplete = transaction.OnComplete.NoOpOC,
+        variable: str | None = None,
+        **abi_kwargs: object,
+    ) -> None:
+        atc = AtomicTransactionComposer()
+        app_client.compose_call(
+            atc,
+            call_abi_method,
+            OnCompleteCallParameters(
+                # Any address will do, the sender is replaced on every build.
+                sender=app_client.app_address,
+                signer=EmptySigner(),
+                suggested_params=sp,
+                on_complete=on_complete,
+            ),
+            **abi_kwargs,
+        )
+        self._txn = cast(transaction.ApplicationCallTxn, atc.txn_list[0].txn)
+        self._txn.group = None
+        self.method = atc.method_dict[0]
+
+        self._arg_index = 0
+        self._arg_type: abi.ABIType | None = None
+        self._encoded: dict[Hashable, bytes] = {}
+        if variable is not None:
+            names = [arg.name for arg in self.method.args]
+            if variable not in names:
+                raise Exception(f"{self.method.name} has no argument {variable}")
+            position = names.index(variable)
+            arg_type = self.method.args[position].type
+            if not isinstance(arg_type, abi.ABIType):
+                raise Exception(f"{variable} is a reference, not an ABI value")
+            # App arg 0 is the selector, method args follow in order.
+            self._arg_index = position + 1
+            self._arg_type = arg_type
+
+    def build(
+        self,
+        sender: str,
+        sp: transaction.SuggestedParams,
+        value: Hashable = None,
+    ) -> transaction.ApplicationCallTxn:
+        """Returns the templated call from `sender`, valid for the rounds of `sp`."""
+        txn = copy.copy(self._txn)
+        txn.sender = sender
+        txn.first_valid_round = sp.first
+        txn.last_valid_round = sp.last
+        if self._arg_type is not None:
+            if value not in self._encoded:
+                self._encoded[value] = self._arg_type.encode(value)
+            txn.app_args = list(txn.app_args)
+            txn.app_args[self._arg_index] = self._encoded[value]
+        return txn
+
+    def with_signer(
+        self,
+        sender: str,
+        signer: TransactionSigner,
+        sp: transaction.SuggestedParams,
+        value: Hashable = None,
+    ) -> TransactionWithSigner:
+        return TransactionWithSigner(self.build(sender, sp, value), signer)
+
+
+def vote_template(
+    app_client: ApplicationClient,
+    registered_asa_id: int,
+    sp: transaction.SuggestedParams,
+) -> CallTemplate:
+    """Template of `vote`, built per call with `in_favor` as the value."""
+    return CallTemplate(
+        app_client,
+        "vote",
+        sp,
+        variable="in_favor",
+        in_favor=False,
+        registered_asa=registered_asa_id,
+    )
+
+
+def register_template(
+    app_client: ApplicationClient,
+    registered_asa_id: int,
+    sp: transaction.SuggestedParams,
+) -> CallTemplate:
+    """Template of the `register` opt-in; `sp` should carry its inner txn fees."""
+    return CallTemplate(
+        app_client,
+        "register",
+        sp,
+        on_complete=transaction.OnComplete.OptInOC,
+        registered_asa=registered_asa_id,
+    )
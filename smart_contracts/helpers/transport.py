@@ -0,0 +1,298 @@
+import dataclasses
+import http.client
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from typing import Any
+from urllib import parse
+
+import algokit_utils
+from algokit_utils import AlgoClientConfig
+from algosdk import constants, error
+from algosdk.v2client.algod import (
+    AlgodClient,
+    AlgodResponseType,
+    ParamsType,
+    api_version_path_prefix,
+)
+from algosdk.v2client.indexer import IndexerClient
+
+logger = logging.getLogger(__name__)
+
+# Used when neither the caller nor HTTP_POOL_SIZE / HTTP_TIMEOUT set a value.
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 30.0
+
+# Path segments made of ids, rounds, addresses or txids are grouped as one endpoint.
+_ID_SEGMENT = re.compile(r"^(\d+|[A-Z2-7]{52,58})$")
+# Errors that mean a kept-alive connection was closed by the server.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+def endpoint_name(method: str, path: str) -> str:
+    segments = parse.urlsplit(path).path.split("/")
+    return f"{method} " + "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments
+    )
+
+
+class PooledTransport:
+    """Keep-alive HTTP connections to one server, shared by up to `pool_size` threads.
+
+    Latency is recorded per endpoint, with ids in the path folded together. The
+    pool size and timeout default to HTTP_POOL_SIZE and HTTP_TIMEOUT, read when
+    the transport is made so that values loaded from .env files apply.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        pool_size: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        if pool_size is None:
+            pool_size = int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+        if timeout is None:
+            timeout = float(os.getenv("HTTP_TIMEOUT", DEFAULT_TIMEOUT))
+        url = parse.urlsplit(address)
+        self.scheme = url.scheme
+        self.host = url.hostname or "localhost"
+        self.port = url.port
+        self.base_path = url.path.rstrip("/")
+        self.timeout = timeout
+        # Free slots hold either an open connection or None, a connection yet to open.
+        self._pool: queue.LifoQueue[http.client.HTTPConnection | None] = (
+            queue.LifoQueue(maxsize=pool_size)
+        )
+        for _ in range(pool_size):
+            self._pool.put(None)
+        self._stats: dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+
+    def latency_stats(self) -> dict[str, EndpointStats]:
+        with self._stats_lock:
+            return {name: dataclasses.replace(s) for name, s in self._stats.items()}
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, bytes]:
+        """Sends a request and returns the status and body of the response."""
+        start = time.monotonic()
+        connection = self._pool.get()
+        try:
+            try:
+                status, response_body, connection = self._send(
+                    connection, method, path, headers, body, timeout
+                )
+            except _STALE_CONNECTION_ERRORS:
+                if connection is None:
+                    raise
+                # The server dropped the idle connection, retry once on a new one.
+                connection.close()
+                status, response_body, connection = self._send(
+                    None, method, path, headers, body, timeout
+                )
+        except Exception:
+            if connection is not None:
+                connection.close()
+            self._pool.put(None)
+            raise
+        self._pool.put(connection)
+        self._record(endpoint_name(method, path), time.monotonic() - start)
+        return status, response_body
+
+    def _send(
+        self,
+        connection: http.client.HTTPConnection | None,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes | None,
+        timeout: float | None,
+    ) -> tuple[int, bytes, http.client.HTTPConnection]:
+        if connection is None:
+            connection_class = (
+                http.client.HTTPSConnection
+                if self.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            connection = connection_class(self.host, self.port, timeout=self.timeout)
+        connection.timeout = timeout or self.timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(connection.timeout)
+        connection.request(method, self.base_path + path, body=body, headers=headers)
+        response = connection.getresponse()
+        response_body = response.read()
+        if response.will_close:
+            connection.close()
+        return response.status, response_body, connection
+
+    def _record(self, endpoint: str, seconds: float) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+
+
+def _request_path(requrl: str, params: ParamsType | None) -> str:
+    if requrl not in constants.unversioned_paths:
+        requrl = api_version_path_prefix + requrl
+    if params:
+        requrl = requrl + "?" + parse.urlencode(params)
+    return requrl
+
+
+class PooledAlgodClient(AlgodClient):
+    """`AlgodClient` sending its requests through a `PooledTransport`."""
+
+    def __init__(
+        self,
+        algod_token: str,
+        algod_address: str,
+        headers: dict[str, str] | None = None,
+        transport: PooledTransport | None = None,
+    ) -> None:
+        super().__init__(algod_token, algod_address, headers)
+        self.transport = transport or PooledTransport(algod_address)
+
+    def algod_request(
+        self,
+        method: str,
+        requrl: str,
+        params: ParamsType | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        response_format: str | None = "json",
+        # None uses the transport's timeout rather than the SDK's 30 seconds.
+        timeout: int | None = None,
+    ) -> AlgodResponseType:
+        header = {"User-Agent": "py-algorand-sdk", **(self.headers or {})}
+        header.update(headers or {})
+        if requrl not in constants.no_auth:
+            header[constants.algod_auth_header] = self.algod_token
+
+        status, body = self.transport.request(
+            method, _request_path(requrl, params), header, data, timeout
+        )
+        if status >= 400:
+            message: Any = body.decode("utf-8")
+            response: dict = {}
+            try:
+                response = json.loads(message)
+                message = response["message"]
+            except (ValueError, KeyError):
+                pass
+            raise error.AlgodHTTPError(message, status, response.get("data"))
+        if response_format != "json":
+            return body
+        if not body:
+            # Some algod responses are a 200 OK with an empty body.
+            return {}
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise error.AlgodResponseError(
+                "Failed to parse JSON response from algod"
+            ) from e
+
+
+class PooledIndexerClient(IndexerClient):
+    """`IndexerClient` sending its requests through a `PooledTransport`."""
+
+    def __init__(
+        self,
+        indexer_token: str,
+        indexer_address: str,
+        headers: dict[str, str] | None = None,
+        transport: PooledTransport | None = None,
+    ) -> None:
+        super().__init__(indexer_token, indexer_address, headers)
+        self.transport = transport or PooledTransport(indexer_address)
+
+    def indexer_request(
+        self,
+        method: str,
+        requrl: str,
+        params: ParamsType | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        # None uses the transport's timeout rather than the SDK's 30 seconds.
+        timeout: int | None = None,
+    ) -> dict:
+        header = {"User-Agent": "py-algorand-sdk", **(self.headers or {})}
+        header.update(headers or {})
+        if requrl not in constants.no_auth and self.indexer_token:
+            header[constants.indexer_auth_header] = self.indexer_token
+
+        status, body = self.transport.request(
+            method, _request_path(requrl, params), header, data, timeout
+        )
+        if status >= 400:
+            message: Any = body.decode("utf-8")
+            try:
+                message = json.loads(message)["message"]
+            except (ValueError, KeyError):
+                pass
+            raise error.IndexerHTTPError(message)
+        return _sort_dict(json.loads(body))
+
+
+def _sort_dict(value: dict) -> dict:
+    return {
+        k: _sort_dict(v) if isinstance(v, dict) else v for k, v in sorted(value.items())
+    }
+
+
+def get_algod_client(
+    config: AlgoClientConfig | None = None,
+    pool_size: int | None = None,
+    timeout: float | None = None,
+) -> PooledAlgodClient:
+    """Same as `algokit_utils.get_algod_client`, over keep-alive connections."""
+    client = algokit_utils.get_algod_client(config)
+    return PooledAlgodClient(
+        client.algod_token,
+        client.algod_address,
+        client.headers,
+        PooledTransport(client.algod_address, pool_size, timeout),
+    )
+
+
+def get_indexer_client(
+    config: AlgoClientConfig | None = None,
+    pool_size: int | None = None,
+    timeout: float | None = None,
+) -> PooledIndexerClient:
+    """Same as `algokit_utils.get_indexer_client`, over keep-alive connections."""
+    client = algokit_utils.get_indexer_client(config)
+    return PooledIndexerClient(
+        client.indexer_token,
+        client.indexer_address,
+        client.headers,
+        PooledTransport(client.indexer_address, pool_size, timeout),
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 import beaker
 import pyteal as pt
 from algokit_utils import DELETABLE_TEMPLATE_NAME, UPDATABLE_TEMPLATE_NAME
@@ -9,6 +11,11 @@ class DaoState:
     end_voting = beaker.GlobalStateValue(pt.TealType.uint64)
     votes_total = beaker.GlobalStateValue(pt.TealType.uint64)
     votes_in_favor = beaker.GlobalStateValue(pt.TealType.uint64)
+    proposal_hash = beaker.GlobalStateValue(pt.TealType.bytes)
+    proposal_chunks = beaker.GlobalStateValue(pt.TealType.uint64)
+    proposal_compressed = beaker.GlobalStateValue(pt.TealType.uint64)
+    shard_index = beaker.GlobalStateValue(pt.TealType.uint64)
+    shard_count = beaker.GlobalStateValue(pt.TealType.uint64)
 
     in_favor = beaker.LocalStateValue(pt.TealType.uint64)
 
@@ -40,6 +47,39 @@ def create(proposal: pt.abi.String, end_voting: pt.abi.Uint64) -> pt.Expr:
     )
 
 
+@app.external(authorize=beaker.Authorize.only_creator())
+def set_proposal_document(
+    content_hash: pt.abi.StaticBytes[Literal[32]],
+    chunks: pt.abi.Uint64,
+    compressed: pt.abi.Bool,
+) -> pt.Expr:
+    return pt.Seq(
+        pt.Assert(pt.Not(app.state.proposal_hash.exists())),
+        app.state.proposal_hash.set(content_hash.get()),
+        app.state.proposal_chunks.set(chunks.get()),
+        app.state.proposal_compressed.set(compressed.get()),
+    )
+
+
+@app.external(authorize=beaker.Authorize.only_creator())
+def put_proposal_chunk(index: pt.abi.Uint64, data: pt.abi.DynamicBytes) -> pt.Expr:
+    return pt.Seq(
+        pt.Assert(index.get() < app.state.proposal_chunks.get()),
+        pt.App.box_put(pt.Itob(index.get()), data.get()),
+    )
+
+
+@app.external(authorize=beaker.Authorize.only_creator())
+def set_shard(index: pt.abi.Uint64, count: pt.abi.Uint64) -> pt.Expr:
+    return pt.Seq(
+        pt.Assert(pt.Not(app.state.shard_count.exists())),
+        pt.Assert(pt.Not(app.state.registered_asa_id.exists())),
+        pt.Assert(index.get() < count.get()),
+        app.state.shard_index.set(index.get()),
+        app.state.shard_count.set(count.get()),
+    )
+
+
 @app.external(authorize=beaker.Authorize.only_creator())
 def bootstrap(*, output: pt.abi.Uint64) -> pt.Expr:
     return pt.Seq(
@@ -48,7 +88,8 @@ def bootstrap(*, output: pt.abi.Uint64) -> pt.Expr:
         pt.InnerTxnBuilder.SetFields(
             {
                 pt.TxnField.type_enum: pt.TxnType.AssetConfig,
-                pt.TxnField.config_asset_total: pt.Int(1_000),
+                # One unit per registered voter, so a shard never runs out.
+                pt.TxnField.config_asset_total: pt.Int(2**64 - 1),
                 pt.TxnField.config_asset_decimals: pt.Int(0),
                 pt.TxnField.config_asset_default_frozen: pt.Int(0),
                 pt.TxnField.config_asset_freeze: pt.Global.current_application_address(),
@@ -66,6 +107,16 @@ def bootstrap(*, output: pt.abi.Uint64) -> pt.Expr:
 def register(registered_asa: pt.abi.Asset) -> pt.Expr:
     return pt.Seq(
         pt.Assert(pt.Global.latest_timestamp() < app.state.end_voting.get()),
+        pt.If(app.state.shard_count.exists()).Then(
+            pt.Assert(
+                pt.Btoi(
+                    pt.Extract(pt.Sha512_256(pt.Txn.sender()), pt.Int(0), pt.Int(8))
+                )
+                % app.state.shard_count.get()
+                == app.state.shard_index.get(),
+                comment="Check sender belongs to this shard",
+            )
+        ),
         (
             asa_balance := pt.AssetHolding.balance(
                 pt.Txn.sender(), app.state.registered_asa_id.get()
@@ -118,19 +169,32 @@ def deregister(registered_asa: pt.abi.Asset) -> pt.Expr:
             )
         ),
         pt.Assert(asa_balance.hasValue()),
-        pt.Assert(asa_balance.value() == pt.Int(1)),
-        pt.InnerTxnBuilder.Begin(),
-        pt.InnerTxnBuilder.SetFields(
-            {
-                pt.TxnField.type_enum: pt.TxnType.AssetTransfer,
-                pt.TxnField.xfer_asset: app.state.registered_asa_id.get(),
-                pt.TxnField.asset_sender: pt.Txn.sender(),
-                pt.TxnField.asset_receiver: pt.Global.current_application_address(),
-                pt.TxnField.asset_amount: pt.Int(1),
-                pt.TxnField.fee: pt.Int(0),
-            }
+        pt.If(asa_balance.value() == pt.Int(1))
+        .Then(
+            pt.InnerTxnBuilder.Begin(),
+            pt.InnerTxnBuilder.SetFields(
+                {
+                    pt.TxnField.type_enum: pt.TxnType.AssetTransfer,
+                    pt.TxnField.xfer_asset: app.state.registered_asa_id.get(),
+                    pt.TxnField.asset_sender: pt.Txn.sender(),
+                    pt.TxnField.asset_receiver: (
+                        pt.Global.current_application_address()
+                    ),
+                    pt.TxnField.asset_amount: pt.Int(1),
+                    pt.TxnField.fee: pt.Int(0),
+                }
+            ),
+            pt.InnerTxnBuilder.Submit(),
+        )
+        .Else(
+            pt.Assert(
+                pt.And(
+                    asa_balance.value() == pt.Int(0),
+                    pt.Global.latest_timestamp() >= app.state.end_voting.get(),
+                ),
+                comment="Check registered ASA was reclaimed",
+            )
         ),
-        pt.InnerTxnBuilder.Submit(),
         maybe_remove_vote(),
     )
 
@@ -160,6 +224,39 @@ def vote(in_favor: pt.abi.Bool, registered_asa: pt.abi.Asset) -> pt.Expr:
     )
 
 
+@app.external(authorize=beaker.Authorize.only_creator())
+def reclaim(registered_asa: pt.abi.Asset) -> pt.Expr:
+    i = pt.ScratchVar(pt.TealType.uint64)
+    return pt.Seq(
+        pt.Assert(pt.Global.latest_timestamp() >= app.state.end_voting.get()),
+        pt.For(
+            i.store(pt.Int(1)),
+            i.load() <= pt.Txn.accounts.length(),
+            i.store(i.load() + pt.Int(1)),
+        ).Do(
+            (
+                asa_balance := pt.AssetHolding.balance(
+                    pt.Txn.accounts[i.load()], app.state.registered_asa_id.get()
+                )
+            ),
+            pt.If(pt.And(asa_balance.hasValue(), asa_balance.value() > pt.Int(0))).Then(
+                pt.InnerTxnBuilder.Execute(
+                    {
+                        pt.TxnField.type_enum: pt.TxnType.AssetTransfer,
+                        pt.TxnField.xfer_asset: app.state.registered_asa_id.get(),
+                        pt.TxnField.asset_sender: pt.Txn.accounts[i.load()],
+                        pt.TxnField.asset_receiver: (
+                            pt.Global.current_application_address()
+                        ),
+                        pt.TxnField.asset_amount: asa_balance.value(),
+                        pt.TxnField.fee: pt.Int(0),
+                    }
+                )
+            ),
+        ),
+    )
+
+
 @app.external(read_only=True)
 def get_proposal(*, output: pt.abi.String) -> pt.Expr:
     return output.set(app.state.proposal.get())
@@ -0,0 +1,213 @@
+import dataclasses
+import hashlib
+import time
+from collections.abc import Callable
+
+import pytest
+from algokit_utils import (
+    Account,
+    ApplicationClient,
+    ApplicationSpecification,
+    TransactionParameters,
+)
+from algokit_utils.deploy import TemplateValueMapping, replace_template_variables
+from algosdk import logic, transaction
+from algosdk.atomic_transaction_composer import (
+    AtomicTransactionComposer,
+    TransactionWithSigner,
+)
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.algod import AlgodClient
+
+CACHE_KEY = "dao/checkpoint"
+# Registered ASA units a reused DAO must still hold, enough for a session's voters.
+MIN_REGISTRATIONS = 100
+
+
+@dataclasses.dataclass
+class Checkpoint:
+    """A created and bootstrapped DAO that LocalNet keeps between sessions."""
+
+    version: str
+    genesis_hash: str
+    creator: str
+    app_id: int
+    registered_asa_id: int
+    approval_program: str
+
+
+def contract_version(
+    app_spec: ApplicationSpecification,
+    template_values: TemplateValueMapping,
+    setup_id: str = "",
+) -> str:
+    programs = replace_template_variables(
+        app_spec.approval_program, template_values
+    ) + replace_template_variables(app_spec.clear_program, template_values)
+    return hashlib.sha256((programs + setup_id).encode()).hexdigest()
+
+
+def _is_live(
+    algod_client: AlgodClient, checkpoint: Checkpoint, min_registrations: int
+) -> bool:
+    try:
+        params = algod_client.application_info(checkpoint.app_id)["params"]
+        holding = algod_client.account_asset_info(
+            logic.get_application_address(checkpoint.app_id),
+            checkpoint.registered_asa_id,
+        )["asset-holding"]
+    except AlgodHTTPError:
+        return False
+    # Every session registers voters for good, using up registered ASA units.
+    return (
+        params["creator"] == checkpoint.creator
+        and params["approval-program"] == checkpoint.approval_program
+        and holding["amount"] >= min_registrations
+    )
+
+
+def restore_or_prepare(
+    cache: pytest.Cache,
+    app_client: ApplicationClient,
+    creator: Account,
+    template_values: TemplateValueMapping,
+    prepare: Callable[[ApplicationClient], int],
+    setup_id: str = "",
+    min_registrations: int = MIN_REGISTRATIONS,
+) -> int:
+    """Points `app_client` at the checkpointed DAO, preparing one if needed.
+
+    `prepare` must create, fund and bootstrap the app and return the registered ASA
+    id. It only runs when no checkpoint matches the contract version, `setup_id`
+    (which should identify the inputs of `prepare`) and the ledger, or when the
+    checkpointed app has fewer than `min_registrations` registrations left.
+    Returns the registered ASA id.
+    """
+    algod_client = app_client.algod_client
+    version = contract_version(app_client.app_spec, template_values, setup_id)
+    genesis_hash = algod_client.versions()["genesis_hash_b64"]
+
+    data = cache.get(CACHE_KEY, None)
+    if data is not None:
+        checkpoint = Checkpoint(**data)
+        if (
+            checkpoint.version == version
+            and checkpoint.genesis_hash == genesis_hash
+            and checkpoint.creator == creator.address
+            and _is_live(algod_client, checkpoint, min_registrations)
+        ):
+            app_client.app_id = checkpoint.app_id
+            return checkpoint.registered_asa_id
+
+    registered_asa_id = prepare(app_client)
+    checkpoint = Checkpoint(
+        version=version,
+        genesis_hash=genesis_hash,
+        creator=creator.address,
+        app_id=app_client.app_id,
+        registered_asa_id=registered_asa_id,
+        approval_program=algod_client.application_info(app_client.app_id)["params"][
+            "approval-program"
+        ],
+    )
+    cache.set(CACHE_KEY, dataclasses.asdict(checkpoint))
+    return registered_asa_id
+
+
+def fund_new_accounts(
+    algod_client: AlgodClient, funder: Account, count: int, amount: int
+) -> list[Account]:
+    """Creates `count` accounts funded by `funder`, in as few groups as possible."""
+    accounts = [Account.new_account() for _ in range(count)]
+    sp = algod_client.suggested_params()
+    group_size = AtomicTransactionComposer.MAX_GROUP_SIZE
+    for start in range(0, count, group_size):
+        atc = AtomicTransactionComposer()
+        for account in accounts[start : start + group_size]:
+            atc.add_transaction(
+                TransactionWithSigner(
+                    transaction.PaymentTxn(funder.address, sp, account.address, amount),
+                    funder.signer,
+                )
+            )
+        atc.execute(algod_client, wait_rounds=4)
+    return accounts
+
+
+def opt_in_to_asset(
+    algod_client: AlgodClient, accounts: list[Account], asset_id: int
+) -> None:
+    """Opts every account in to an asset, in as few groups as possible."""
+    sp = algod_client.suggested_params()
+    group_size = AtomicTransactionComposer.MAX_GROUP_SIZE
+    for start in range(0, len(accounts), group_size):
+        atc = AtomicTransactionComposer()
+        for account in accounts[start : start + group_size]:
+            atc.add_transaction(
+                TransactionWithSigner(
+                    transaction.AssetTransferTxn(
+                        account.address, sp, account.address, 0, asset_id
+                    ),
+                    account.signer,
+                )
+            )
+        atc.execute(algod_client, wait_rounds=4)
+
+
+def register_voters(
+    app_client: ApplicationClient,
+    accounts: list[Account],
+    registered_asa_id: int,
+    sp: transaction.SuggestedParams,
+) -> None:
+    """Registers every account with the DAO, in as few groups as possible.
+
+    `sp` must carry the fee of a `register` call, inner transactions included.
+    """
+    group_size = AtomicTransactionComposer.MAX_GROUP_SIZE
+    for start in range(0, len(accounts), group_size):
+        atc = AtomicTransactionComposer()
+        for account in accounts[start : start + group_size]:
+            app_client.compose_opt_in(
+                atc,
+                "register",
+                TransactionParameters(
+                    sender=account.address, signer=account.signer, suggested_params=sp
+                ),
+                registered_asa=registered_asa_id,
+            )
+        app_client.execute_atc(atc)
+
+
+def latest_timestamp(algod_client: AlgodClient) -> int:
+    last_round = algod_client.status()["last-round"]
+    return int(algod_client.block_info(last_round)["block"]["ts"])
+
+
+def wait_for_timestamp(
+    algod_client: AlgodClient, funder: Account, timestamp: int, timeout: float = 120
+) -> None:
+    """Waits until the latest block is at least as late as `timestamp`.
+
+    LocalNet in dev mode only makes a block per transaction, so an empty payment
+    is sent every second to move its clock forward.
+    """
+    deadline = time.monotonic() + timeout
+    while latest_timestamp(algod_client) < timestamp:
+        if time.monotonic() > deadline:
+            raise Exception(f"LocalNet did not reach timestamp {timestamp}")
+        time.sleep(1)
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(
+            TransactionWithSigner(
+                transaction.PaymentTxn(
+                    funder.address,
+                    algod_client.suggested_params(),
+                    funder.address,
+                    0,
+                    note=str(time.time_ns()).encode(),
+                ),
+                funder.signer,
+            )
+        )
+        atc.execute(algod_client, wait_rounds=4)
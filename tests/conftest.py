@@ -1,13 +1,13 @@
 from pathlib import Path
 
 import pytest
-from algokit_utils import (
-    get_algod_client,
-    is_localnet,
-)
+from algokit_utils import is_localnet
 from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
 from dotenv import load_dotenv
 
+from smart_contracts.helpers.transport import get_algod_client, get_indexer_client
+
 
 @pytest.fixture(autouse=True, scope="session")
 def environment_fixture() -> None:
@@ -23,3 +23,8 @@ def algod_client() -> AlgodClient:
     # included here to prevent accidentally running against other networks
     assert is_localnet(client)
     return client
+
+
+@pytest.fixture(scope="session")
+def indexer_client() -> IndexerClient:
+    return get_indexer_client()
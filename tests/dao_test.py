@@ -1,3 +1,8 @@
+import os
+import random
+import string
+import time
+
 import algokit_utils.logic_error
 import algosdk
 import pytest
@@ -7,13 +12,37 @@ from algokit_utils import (
     ApplicationSpecification,
     TransactionParameters,
     get_localnet_default_account,
-    get_or_create_kmd_wallet_account, OnCompleteCallParameters,
+    get_or_create_kmd_wallet_account, OnCompleteCallParameters, TransferParameters,
+    transfer,
 )
 from algosdk import transaction
 from algosdk.atomic_transaction_composer import AtomicTransactionComposer
 from algosdk.v2client.algod import AlgodClient
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client.indexer import IndexerClient
+from checkpoint import (
+    fund_new_accounts,
+    latest_timestamp,
+    opt_in_to_asset,
+    register_voters,
+    restore_or_prepare,
+    wait_for_timestamp,
+)
+from fuzz import DaoFuzzer
 
 from smart_contracts.dao import contract as dao_contract
+from smart_contracts.helpers.fees import FeeEstimator, min_fee
+from smart_contracts.helpers.proposal import (
+    ProposalDocument,
+    document_min_balance,
+    encode_document,
+    upload_proposal_document,
+)
+from smart_contracts.helpers.shard import deploy_shards, shard_of
+from smart_contracts.helpers.submit import SubmissionScheduler
+from smart_contracts.helpers.sweep import reclaim_params, sweep
+from smart_contracts.helpers.tally import Tally
+from smart_contracts.helpers.templates import register_template, vote_template
 
 
 @pytest.fixture(scope="session")
@@ -26,6 +55,9 @@ def creator_account(algod_client: AlgodClient) -> Account:
     return get_localnet_default_account(algod_client)
 
 
+TEMPLATE_VALUES = {"UPDATABLE": 1, "DELETABLE": 1}
+
+
 @pytest.fixture(scope="session")
 def dao_client(
     algod_client: AlgodClient,
@@ -36,11 +68,16 @@ def dao_client(
         algod_client,
         app_spec=dao_app_spec,
         signer=creator_account,
-        template_values={"UPDATABLE": 1, "DELETABLE": 1},
+        template_values=TEMPLATE_VALUES,
     )
     return client
 
 
+@pytest.fixture(scope="session")
+def fee_estimator(dao_client: ApplicationClient) -> FeeEstimator:
+    return FeeEstimator(dao_client)
+
+
 @pytest.fixture(scope="session")
 def other_account(algod_client: AlgodClient) -> Account:
     return get_or_create_kmd_wallet_account(
@@ -52,6 +89,56 @@ PROPOSAL = "This is another proposal."
 END_VOTING = 16927981910
 
 
+@pytest.fixture(scope="session")
+def checkpoint_dao(
+    pytestconfig: pytest.Config,
+    algod_client: AlgodClient,
+    dao_app_spec: ApplicationSpecification,
+    creator_account: Account,
+    fee_estimator: FeeEstimator,
+) -> tuple[ApplicationClient, int]:
+    """A created and bootstrapped DAO, reused across sessions while it is current.
+
+    The `dao_client` chain still creates its own app every session, because it
+    tests creation and bootstrap themselves and asserts tallies counted from zero.
+    This app accumulates votes across sessions instead: tests on it use new voters
+    and only check changes to the tally, never its absolute value.
+    """
+    client = ApplicationClient(
+        algod_client,
+        app_spec=dao_app_spec,
+        signer=creator_account,
+        template_values=TEMPLATE_VALUES,
+    )
+
+    def prepare(app_client: ApplicationClient) -> int:
+        app_client.create(proposal=PROPOSAL, end_voting=END_VOTING)
+        transfer(
+            algod_client,
+            TransferParameters(
+                from_account=creator_account,
+                to_address=app_client.app_address,
+                micro_algos=200_000,
+            ),
+        )
+        return app_client.call(
+            dao_contract.bootstrap,
+            transaction_parameters=fee_estimator.for_client(app_client).with_fee(
+                dao_contract.bootstrap
+            ),
+        ).return_value
+
+    registered_asa_id = restore_or_prepare(
+        pytestconfig.cache,
+        client,
+        creator_account,
+        TEMPLATE_VALUES,
+        prepare,
+        setup_id=f"{PROPOSAL}/{END_VOTING}",
+    )
+    return client, registered_asa_id
+
+
 def test_deploy(dao_client: ApplicationClient):
     dao_client.create(proposal=PROPOSAL, end_voting=END_VOTING)
 
@@ -62,6 +149,29 @@ def test_get_proposal(dao_client: ApplicationClient):
     assert dao_client.get_global_state()["proposal"] == PROPOSAL
 
 
+def test_proposal_document(dao_client: ApplicationClient, creator_account: Account):
+    # Random text barely compresses, so the upload spans several groups.
+    rng = random.Random(0)
+    document = "".join(rng.choices(string.ascii_letters + string.digits, k=60_000))
+    transfer(
+        dao_client.algod_client,
+        TransferParameters(
+            from_account=creator_account,
+            to_address=dao_client.app_address,
+            micro_algos=document_min_balance(encode_document(document, compress=True)),
+        ),
+    )
+
+    content_hash = upload_proposal_document(dao_client, document)
+
+    proposal = ProposalDocument(dao_client)
+    assert proposal.chunks > AtomicTransactionComposer.MAX_GROUP_SIZE
+    assert proposal.content_hash == content_hash
+    assert proposal.read() == document
+    with pytest.raises(algokit_utils.logic_error.LogicError):
+        upload_proposal_document(dao_client, document)
+
+
 def test_get_registered_asa_negative(dao_client: ApplicationClient):
     with pytest.raises(algokit_utils.logic_error.LogicError):
         dao_client.call(dao_contract.get_registered_asa)
@@ -99,14 +209,11 @@ def test_bootstrap_negative(
         )
 
 
-def test_bootstrap(dao_client: ApplicationClient):
+def test_bootstrap(dao_client: ApplicationClient, fee_estimator: FeeEstimator):
     # Bootstrap the contract.
-    sp = dao_client.algod_client.suggested_params()
-    sp.fee = 3_000
-    sp.flat_fee = True
     dao_client.call(
         dao_contract.bootstrap,
-        transaction_parameters=TransactionParameters(suggested_params=sp),
+        transaction_parameters=fee_estimator.with_fee(dao_contract.bootstrap),
     )
 
 
@@ -135,7 +242,10 @@ def test_vote_negative(
 
 
 def test_register(
-    dao_client: ApplicationClient, other_account: Account, registered_asa_id: int
+    dao_client: ApplicationClient,
+    fee_estimator: FeeEstimator,
+    other_account: Account,
+    registered_asa_id: int,
 ):
     # Opt-in to the Registered ASA.
     dao_client.algod_client.send_transactions(
@@ -153,16 +263,17 @@ def test_register(
         )
     )
 
-    sp = dao_client.algod_client.suggested_params()
-    sp.fee = 3_000
-    sp.flat_fee = True
     dao_client.opt_in(
         dao_contract.register,
         registered_asa=registered_asa_id,
-        transaction_parameters=TransactionParameters(
-            sender=other_account.address,
-            signer=other_account.signer,
-            suggested_params=sp,
+        transaction_parameters=fee_estimator.with_fee(
+            dao_contract.register,
+            TransactionParameters(
+                sender=other_account.address,
+                signer=other_account.signer,
+            ),
+            on_complete=transaction.OnComplete.OptInOC,
+            registered_asa=registered_asa_id,
         ),
     )
 
@@ -236,21 +347,23 @@ def test_vote_and_get_votes(
 
 def test_deregister(
     dao_client: ApplicationClient,
+    fee_estimator: FeeEstimator,
     creator_account: Account,
     other_account: Account,
     registered_asa_id: int,
 ):
     # This demonstrates that the user is able to close out of the contract.
-    sp = dao_client.algod_client.suggested_params()
-    sp.fee = 2_000
-    sp.flat_fee = True
     dao_client.close_out(
         dao_contract.deregister,
         registered_asa=registered_asa_id,
-        transaction_parameters=TransactionParameters(
-            sender=other_account.address,
-            signer=other_account.signer,
-            suggested_params=sp,
+        transaction_parameters=fee_estimator.with_fee(
+            dao_contract.deregister,
+            TransactionParameters(
+                sender=other_account.address,
+                signer=other_account.signer,
+            ),
+            on_complete=transaction.OnComplete.CloseOutOC,
+            registered_asa=registered_asa_id,
         ),
     )
     votes = dao_client.call(dao_contract.get_votes).return_value
@@ -308,16 +421,17 @@ def test_deregister(
         )
     )
 
-    sp = dao_client.algod_client.suggested_params()
-    sp.fee = 3_000
-    sp.flat_fee = True
     dao_client.opt_in(
         dao_contract.register,
         registered_asa=registered_asa_id,
-        transaction_parameters=TransactionParameters(
-            sender=other_account.address,
-            signer=other_account.signer,
-            suggested_params=sp,
+        transaction_parameters=fee_estimator.with_fee(
+            dao_contract.register,
+            TransactionParameters(
+                sender=other_account.address,
+                signer=other_account.signer,
+            ),
+            on_complete=transaction.OnComplete.OptInOC,
+            registered_asa=registered_asa_id,
         ),
     )
 
@@ -335,6 +449,180 @@ def test_deregister(
     assert votes[1] == 0
 
 
+def test_reclaim_before_deadline(
+    dao_client: ApplicationClient, other_account: Account, registered_asa_id: int
+):
+    sp = reclaim_params(dao_client.algod_client.suggested_params(), 1)
+    with pytest.raises(algokit_utils.logic_error.LogicError):
+        dao_client.call(
+            dao_contract.reclaim,
+            registered_asa=registered_asa_id,
+            transaction_parameters=OnCompleteCallParameters(
+                accounts=[other_account.address], suggested_params=sp
+            ),
+        )
+
+
+def asset_balance(algod_client: AlgodClient, address: str, asset_id: int) -> int:
+    try:
+        holding = algod_client.account_asset_info(address, asset_id)["asset-holding"]
+    except AlgodHTTPError:
+        return 0
+    return holding["amount"]
+
+
+SWEPT_HOLDERS = 70
+RECLAIM_WINDOW = 30
+
+
+@pytest.fixture(scope="session")
+def expired_dao(
+    algod_client: AlgodClient,
+    dao_app_spec: ApplicationSpecification,
+    creator_account: Account,
+    fee_estimator: FeeEstimator,
+) -> tuple[ApplicationClient, int, list[Account], Account, Account]:
+    """A DAO whose voting ended after `SWEPT_HOLDERS` accounts registered.
+
+    Also returns an account opted in to the registered ASA with a 0 balance and
+    one that never opted in.
+    """
+    client = ApplicationClient(
+        algod_client,
+        app_spec=dao_app_spec,
+        signer=creator_account,
+        template_values=TEMPLATE_VALUES,
+    )
+    end_voting = latest_timestamp(algod_client) + RECLAIM_WINDOW
+    client.create(proposal=PROPOSAL, end_voting=end_voting)
+    transfer(
+        algod_client,
+        TransferParameters(
+            from_account=creator_account,
+            to_address=client.app_address,
+            micro_algos=200_000,
+        ),
+    )
+    registered_asa_id = client.call(
+        dao_contract.bootstrap,
+        transaction_parameters=fee_estimator.for_client(client).with_fee(
+            dao_contract.bootstrap
+        ),
+    ).return_value
+
+    accounts = fund_new_accounts(
+        algod_client, creator_account, SWEPT_HOLDERS + 2, 1_000_000
+    )
+    holders, zero_holder, outsider = (
+        accounts[:SWEPT_HOLDERS],
+        accounts[-2],
+        accounts[-1],
+    )
+    opt_in_to_asset(algod_client, [*holders, zero_holder], registered_asa_id)
+    register_voters(
+        client,
+        holders,
+        registered_asa_id,
+        fee_estimator.for_client(client).suggested_params(
+            dao_contract.register,
+            TransactionParameters(sender=holders[0].address, signer=holders[0].signer),
+            on_complete=transaction.OnComplete.OptInOC,
+            registered_asa=registered_asa_id,
+        ),
+    )
+    wait_for_timestamp(algod_client, creator_account, end_voting)
+    return client, registered_asa_id, holders, zero_holder, outsider
+
+
+def test_reclaim_negative(
+    expired_dao: tuple[ApplicationClient, int, list[Account], Account, Account],
+    other_account: Account,
+):
+    client, registered_asa_id, holders, _, _ = expired_dao
+    sp = reclaim_params(client.algod_client.suggested_params(), 1)
+    with pytest.raises(algokit_utils.logic_error.LogicError):
+        client.call(
+            dao_contract.reclaim,
+            registered_asa=registered_asa_id,
+            transaction_parameters=OnCompleteCallParameters(
+                sender=other_account.address,
+                signer=other_account.signer,
+                accounts=[holders[0].address],
+                suggested_params=sp,
+            ),
+        )
+    assert asset_balance(client.algod_client, holders[0].address, registered_asa_id)
+
+
+def test_reclaim(
+    expired_dao: tuple[ApplicationClient, int, list[Account], Account, Account],
+    fee_estimator: FeeEstimator,
+):
+    client, registered_asa_id, holders, zero_holder, outsider = expired_dao
+    algod_client = client.algod_client
+    app_balance = asset_balance(algod_client, client.app_address, registered_asa_id)
+    parameters = OnCompleteCallParameters(
+        accounts=[holders[0].address, zero_holder.address, outsider.address]
+    )
+
+    response = client.call(
+        dao_contract.reclaim,
+        registered_asa=registered_asa_id,
+        transaction_parameters=fee_estimator.for_client(client).with_fee(
+            dao_contract.reclaim, parameters, registered_asa=registered_asa_id
+        ),
+    )
+
+    # Only the frozen holding of the registered holder is clawed back.
+    assert len(response.tx_info["inner-txns"]) == 1
+    holding = algod_client.account_asset_info(holders[0].address, registered_asa_id)
+    assert holding["asset-holding"]["amount"] == 0
+    assert holding["asset-holding"]["is-frozen"]
+    assert asset_balance(algod_client, zero_holder.address, registered_asa_id) == 0
+    assert (
+        asset_balance(algod_client, client.app_address, registered_asa_id)
+        == app_balance + 1
+    )
+    # The estimate pays for the one clawback, not for every referenced account.
+    sp = algod_client.suggested_params()
+    assert response.tx_info["txn"]["txn"]["fee"] == 2 * min_fee(sp)
+
+    # A reclaimed voter can still close out, without a clawback.
+    response = client.close_out(
+        dao_contract.deregister,
+        registered_asa=registered_asa_id,
+        transaction_parameters=TransactionParameters(
+            sender=holders[0].address, signer=holders[0].signer
+        ),
+    )
+    assert not response.tx_info.get("inner-txns")
+
+
+def test_sweep(
+    expired_dao: tuple[ApplicationClient, int, list[Account], Account, Account],
+    indexer_client: IndexerClient,
+):
+    client, registered_asa_id, holders, _, _ = expired_dao
+    algod_client = client.algod_client
+    remaining = [
+        holder
+        for holder in holders
+        if asset_balance(algod_client, holder.address, registered_asa_id)
+    ]
+    last_round = algod_client.status()["last-round"]
+    while indexer_client.health()["round"] < last_round:
+        time.sleep(0.5)
+
+    with SubmissionScheduler(algod_client) as scheduler:
+        swept = sweep(client, indexer_client, registered_asa_id, scheduler)
+
+    assert swept == len(remaining) > AtomicTransactionComposer.MAX_GROUP_SIZE * 4
+    assert not any(
+        asset_balance(algod_client, holder.address, registered_asa_id)
+        for holder in holders
+    )
+
+
 def test_clear_state(
     dao_client: ApplicationClient, other_account: Account, registered_asa_id: int
 ):
@@ -373,3 +661,156 @@ def test_clear_state(
                 suggested_params=sp,
             ),
         )
+
+
+def test_checkpoint_voter(
+    checkpoint_dao: tuple[ApplicationClient, int],
+    algod_client: AlgodClient,
+    creator_account: Account,
+    fee_estimator: FeeEstimator,
+):
+    client, registered_asa_id = checkpoint_dao
+    (voter,) = fund_new_accounts(algod_client, creator_account, 1, 1_000_000)
+
+    algod_client.send_transactions(
+        voter.signer.sign_transactions(
+            [
+                algosdk.transaction.AssetTransferTxn(
+                    voter.address,
+                    algod_client.suggested_params(),
+                    voter.address,
+                    0,
+                    registered_asa_id,
+                )
+            ],
+            [0],
+        )
+    )
+    voter_parameters = TransactionParameters(sender=voter.address, signer=voter.signer)
+    state_before = client.get_global_state()
+    client.opt_in(
+        dao_contract.register,
+        registered_asa=registered_asa_id,
+        transaction_parameters=fee_estimator.for_client(client).with_fee(
+            dao_contract.register,
+            voter_parameters,
+            on_complete=transaction.OnComplete.OptInOC,
+            registered_asa=registered_asa_id,
+        ),
+    )
+    client.call(
+        dao_contract.vote,
+        in_favor=True,
+        registered_asa=registered_asa_id,
+        transaction_parameters=voter_parameters,
+    )
+    assert client.get_local_state(voter.address)["in_favor"] == 1
+    state = client.get_global_state()
+    for key in ("votes_total", "votes_in_favor"):
+        assert state[key] == state_before.get(key, 0) + 1
+
+
+def test_vote_templates(
+    checkpoint_dao: tuple[ApplicationClient, int],
+    algod_client: AlgodClient,
+    creator_account: Account,
+    fee_estimator: FeeEstimator,
+):
+    client, registered_asa_id = checkpoint_dao
+    voters = fund_new_accounts(algod_client, creator_account, 2, 1_000_000)
+    opt_in_to_asset(algod_client, voters, registered_asa_id)
+
+    register_sp = fee_estimator.for_client(client).suggested_params(
+        dao_contract.register,
+        TransactionParameters(sender=voters[0].address, signer=voters[0].signer),
+        on_complete=transaction.OnComplete.OptInOC,
+        registered_asa=registered_asa_id,
+    )
+    register = register_template(client, registered_asa_id, register_sp)
+    vote = vote_template(client, registered_asa_id, algod_client.suggested_params())
+
+    sp = algod_client.suggested_params()
+    for voter, in_favor in zip(voters, (True, False), strict=True):
+        atc = AtomicTransactionComposer()
+        atc.add_transaction(register.with_signer(voter.address, voter.signer, sp))
+        atc.add_transaction(
+            vote.with_signer(voter.address, voter.signer, sp, in_favor)
+        )
+        atc.execute(algod_client, 4)
+        assert client.get_local_state(voter.address)["in_favor"] == int(in_favor)
+
+
+FUZZ_SEQUENCES = int(os.environ.get("DAO_FUZZ_SEQUENCES", "500"))
+FUZZ_SEED = int(os.environ.get("DAO_FUZZ_SEED", "0"))
+
+
+def test_fuzz_method_sequences(
+    checkpoint_dao: tuple[ApplicationClient, int],
+    algod_client: AlgodClient,
+    creator_account: Account,
+):
+    client, registered_asa_id = checkpoint_dao
+    voters = fund_new_accounts(algod_client, creator_account, 8, 1_000_000)
+    opt_in_to_asset(algod_client, voters, registered_asa_id)
+
+    mismatches = DaoFuzzer(client, registered_asa_id, voters).run(
+        FUZZ_SEQUENCES, seed=FUZZ_SEED
+    )
+    assert not mismatches, f"seed {FUZZ_SEED}: {mismatches[:5]}"
+
+
+def test_sharded_tally(
+    algod_client: AlgodClient,
+    dao_app_spec: ApplicationSpecification,
+    creator_account: Account,
+    fee_estimator: FeeEstimator,
+):
+    sharded = deploy_shards(
+        algod_client,
+        dao_app_spec,
+        creator_account,
+        PROPOSAL,
+        END_VOTING,
+        shard_count=3,
+        template_values=TEMPLATE_VALUES,
+    )
+    # Registrations are not capped by the registered ASA supply.
+    asset = algod_client.asset_info(sharded.shards[0].registered_asa_id)
+    assert asset["params"]["total"] == 2**64 - 1
+
+    (voter,) = fund_new_accounts(algod_client, creator_account, 1, 1_000_000)
+    shard = sharded.shard_for(voter.address)
+    other = sharded.shards[(shard.index + 1) % 3]
+    assert shard.index == shard_of(voter.address, 3)
+    opt_in_to_asset(algod_client, [voter], shard.registered_asa_id)
+    opt_in_to_asset(algod_client, [voter], other.registered_asa_id)
+
+    voter_parameters = TransactionParameters(sender=voter.address, signer=voter.signer)
+    register_parameters = fee_estimator.for_client(shard.app_client).with_fee(
+        dao_contract.register,
+        voter_parameters,
+        on_complete=transaction.OnComplete.OptInOC,
+        registered_asa=shard.registered_asa_id,
+    )
+    # With the fee of a successful register, only the shard check can reject it.
+    with pytest.raises(
+        algokit_utils.logic_error.LogicError, match="sender belongs to this shard"
+    ):
+        other.app_client.opt_in(
+            dao_contract.register,
+            registered_asa=other.registered_asa_id,
+            transaction_parameters=register_parameters,
+        )
+    shard.app_client.opt_in(
+        dao_contract.register,
+        registered_asa=shard.registered_asa_id,
+        transaction_parameters=register_parameters,
+    )
+    shard.app_client.call(
+        dao_contract.vote,
+        in_favor=True,
+        registered_asa=shard.registered_asa_id,
+        transaction_parameters=voter_parameters,
+    )
+
+    assert sharded.tally(creator=creator_account.address) == Tally(1, 1)
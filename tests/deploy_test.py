@@ -0,0 +1,37 @@
+import pytest
+
+from smart_contracts.helpers.deploy import get_deploy_targets
+
+
+def test_get_deploy_targets_reads_each_profile(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DEPLOY_TARGETS", " localnet_a, LOCALNET_B ,")
+    for name, port in (("LOCALNET_A", 4), ("LOCALNET_B", 5)):
+        monkeypatch.setenv(f"{name}_ALGOD_SERVER", "http://localhost")
+        monkeypatch.setenv(f"{name}_ALGOD_PORT", f"{port}001")
+        monkeypatch.setenv(f"{name}_ALGOD_TOKEN", "a" * 64)
+        monkeypatch.setenv(f"{name}_INDEXER_SERVER", "http://localhost:9999")
+        monkeypatch.setenv(f"{name}_INDEXER_PORT", f"{port}980")
+    monkeypatch.delenv("LOCALNET_B_INDEXER_TOKEN", raising=False)
+    monkeypatch.setenv("LOCALNET_A_KMD_PORT", "4002")
+    monkeypatch.delenv("LOCALNET_B_KMD_PORT", raising=False)
+
+    a, b = get_deploy_targets()
+
+    assert (a.name, b.name) == ("LOCALNET_A", "LOCALNET_B")
+    assert a.algod_config.server == "http://localhost:4001"
+    assert a.algod_config.token == "a" * 64
+    assert b.indexer_config.server == "http://localhost:5980"
+    assert b.indexer_config.token == ""
+    assert a.deployer_name == "LOCALNET_A_DEPLOYER"
+    kmd_client = a.kmd_client()
+    assert kmd_client is not None
+    assert kmd_client.kmd_address == "http://localhost:4002"
+    assert kmd_client.kmd_token == "a" * 64
+    assert b.kmd_client() is None
+
+    monkeypatch.delenv("LOCALNET_B_ALGOD_SERVER")
+    with pytest.raises(Exception, match="LOCALNET_B_ALGOD_SERVER"):
+        get_deploy_targets()
+
+    monkeypatch.delenv("DEPLOY_TARGETS")
+    assert get_deploy_targets() == []
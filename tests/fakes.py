@@ -0,0 +1,36 @@
+from algokit_utils import Account
+from algosdk import transaction
+from algosdk.atomic_transaction_composer import TransactionWithSigner
+from algosdk.error import AlgodHTTPError
+
+
+class FakeAlgod:
+    """Algod that rejects sends with the queued `errors`, then records them."""
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        self.sent: list[list[transaction.SignedTransaction]] = []
+        self.looked_up: list[str] = []
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        return transaction.SuggestedParams(
+            fee=0, first=100, last=1_100, gh="A" * 44, min_fee=1_000
+        )
+
+    def send_transactions(self, signed: list[transaction.SignedTransaction]) -> str:
+        if self.errors:
+            raise AlgodHTTPError(self.errors.pop(0), 400)
+        self.sent.append(signed)
+        return signed[0].get_txid()
+
+    def pending_transaction_info(self, txid: str) -> dict:
+        self.looked_up.append(txid)
+        raise AlgodHTTPError("txn does not exist", 404)
+
+
+def payment(account: Account, amount: int) -> TransactionWithSigner:
+    sp = transaction.SuggestedParams(fee=0, first=1, last=2, gh="A" * 44)
+    return TransactionWithSigner(
+        transaction.PaymentTxn(account.address, sp, account.address, amount),
+        account.signer,
+    )
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from typing import cast
+
+import pytest
+from algokit_utils import ApplicationClient, TransactionParameters
+from algosdk import transaction
+
+from smart_contracts.helpers.fees import USAGE_SCALE, FeeEstimator
+
+
+def app_client(app_id: int, binary_hash: str) -> ApplicationClient:
+    sp = transaction.SuggestedParams(fee=0, first=1, last=2, gh="A" * 44)
+    return cast(
+        ApplicationClient,
+        SimpleNamespace(
+            app_id=app_id,
+            approval=SimpleNamespace(binary_hash=binary_hash),
+            suggested_params=sp,
+        ),
+    )
+
+
+def test_estimates_are_shared_by_program_and_accounts(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    simulated = []
+
+    def simulate_usage(
+        self: FeeEstimator,
+        call_abi_method: str,
+        parameters: TransactionParameters,
+        *_: object,
+    ) -> int:
+        simulated.append((self.app_client.app_id, len(parameters.accounts or [])))
+        return (1 + len(parameters.accounts or [])) * USAGE_SCALE
+
+    monkeypatch.setattr(FeeEstimator, "_simulate_usage", simulate_usage)
+    estimator = FeeEstimator(app_client(1, "program"))
+    shard = estimator.for_client(app_client(2, "program"))
+    other = estimator.for_client(app_client(3, "other program"))
+
+    assert estimator.suggested_params("reclaim").fee == 1_000
+    assert shard.suggested_params("reclaim").fee == 1_000
+    accounts = TransactionParameters(accounts=["A", "B", "C"])
+    assert shard.suggested_params("reclaim", accounts).fee == 4_000
+    assert estimator.suggested_params("reclaim", accounts).fee == 4_000
+    assert other.suggested_params("reclaim").fee == 1_000
+
+    assert simulated == [(1, 0), (2, 3), (3, 0)]
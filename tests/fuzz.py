@@ -0,0 +1,259 @@
+import dataclasses
+import random
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from algokit_utils import Account, ApplicationClient, TransactionParameters
+from algosdk import transaction
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+
+from smart_contracts.helpers.simulate import decode_return, simulate_atc
+
+STEP_KINDS = ("register", "vote", "deregister", "clear_state", "get_votes")
+
+
+@dataclasses.dataclass(frozen=True)
+class Step:
+    kind: str
+    voter: int
+    in_favor: bool = False
+
+
+@dataclasses.dataclass
+class VoterModel:
+    registered_asa_balance: int = 0
+    frozen: bool = False
+    opted_in: bool = False
+    in_favor: bool | None = None
+
+
+@dataclasses.dataclass
+class DaoModel:
+    """Pure-Python model of `DaoState` and of the voters' registered ASA holdings."""
+
+    votes_total: int | None
+    votes_in_favor: int
+    voters: list[VoterModel]
+
+    def apply(self, step: Step) -> tuple[bool, tuple[int, int] | None]:
+        """Applies a step, returning whether it succeeds and what it reads."""
+        voter = self.voters[step.voter]
+        match step.kind:
+            case "register":
+                # A frozen holding cannot receive the registered ASA again.
+                if voter.opted_in or voter.registered_asa_balance or voter.frozen:
+                    return False, None
+                voter.opted_in = True
+                voter.registered_asa_balance = 1
+                voter.frozen = True
+            case "vote":
+                if (
+                    not voter.opted_in
+                    or voter.registered_asa_balance != 1
+                    or voter.in_favor is not None
+                ):
+                    return False, None
+                voter.in_favor = step.in_favor
+                self.votes_total = (self.votes_total or 0) + 1
+                self.votes_in_favor += int(step.in_favor)
+            case "deregister":
+                if not voter.opted_in or voter.registered_asa_balance != 1:
+                    return False, None
+                voter.registered_asa_balance = 0
+                self._remove_vote(voter)
+            case "clear_state":
+                if not voter.opted_in:
+                    return False, None
+                self._remove_vote(voter)
+            case "get_votes":
+                if self.votes_total is None:
+                    return False, None
+                return True, (self.votes_total, self.votes_in_favor)
+        return True, None
+
+    def _remove_vote(self, voter: VoterModel) -> None:
+        if voter.in_favor is not None:
+            self.votes_total = (self.votes_total or 0) - 1
+            self.votes_in_favor -= int(voter.in_favor)
+        voter.in_favor = None
+        voter.opted_in = False
+
+
+def _steps(model: DaoModel) -> list[Step]:
+    return [
+        Step(kind, voter, in_favor)
+        for kind in STEP_KINDS
+        for voter in range(len(model.voters))
+        for in_favor in ((False, True) if kind == "vote" else (False,))
+    ]
+
+
+def _succeeds(model: DaoModel, step: Step) -> bool:
+    # A step only changes the counters and its own voter, so only those are copied.
+    voters = list(model.voters)
+    voters[step.voter] = dataclasses.replace(voters[step.voter])
+    return dataclasses.replace(model, voters=voters).apply(step)[0]
+
+
+def random_sequence(
+    rng: random.Random, model: DaoModel, max_length: int, invalid_rate: float = 0.25
+) -> list[Step]:
+    """Walks the model through steps that succeed, up to `max_length` of them.
+
+    With probability `invalid_rate`, the walk stops at a random depth instead and
+    ends with one step the model rejects there.
+    """
+    model = deepcopy(model)
+    invalid_at = rng.randrange(max_length) if rng.random() < invalid_rate else None
+    sequence: list[Step] = []
+    while len(sequence) < max_length:
+        steps = _steps(model)
+        if len(sequence) == invalid_at:
+            invalid = [step for step in steps if not _succeeds(model, step)]
+            if invalid:
+                sequence.append(rng.choice(invalid))
+            break
+        valid = [step for step in steps if _succeeds(model, step)]
+        if not valid:
+            break
+        step = rng.choice(valid)
+        model.apply(step)
+        sequence.append(step)
+    return sequence
+
+
+def expected_outcome(
+    model: DaoModel, sequence: list[Step]
+) -> tuple[int | None, list[tuple[int, tuple[int, int]]]]:
+    """Returns the index of the first failing step and the reads before it."""
+    model = deepcopy(model)
+    reads = []
+    for i, step in enumerate(sequence):
+        ok, read = model.apply(step)
+        if not ok:
+            return i, reads
+        if read is not None:
+            reads.append((i, read))
+    return None, reads
+
+
+class DaoFuzzer:
+    """Checks random method sequences against `DaoModel` through simulate.
+
+    Simulate does not persist state, so every sequence starts from the same ledger:
+    voters that have opted in to the registered ASA and nothing else. Each sequence
+    is simulated as one group, which bounds its length to the group size, and is
+    made of steps the model accepts, possibly ending with one it rejects.
+    """
+
+    def __init__(
+        self,
+        app_client: ApplicationClient,
+        registered_asa_id: int,
+        voters: list[Account],
+    ) -> None:
+        self.app_client = app_client
+        self.registered_asa_id = registered_asa_id
+        self.voters = voters
+        self.get_votes_method = app_client.app_spec.contract.get_method_by_name(
+            "get_votes"
+        )
+
+    def initial_model(self) -> DaoModel:
+        global_state = self.app_client.get_global_state()
+        votes_total = global_state.get("votes_total")
+        return DaoModel(
+            votes_total=votes_total if isinstance(votes_total, int) else None,
+            votes_in_favor=int(global_state.get("votes_in_favor", 0)),
+            voters=[VoterModel() for _ in self.voters],
+        )
+
+    def run(
+        self,
+        sequences: int,
+        seed: int,
+        max_length: int = AtomicTransactionComposer.MAX_GROUP_SIZE,
+        max_workers: int = 16,
+    ) -> list[str]:
+        """Checks `sequences` random sequences and returns the mismatches found."""
+        rng = random.Random(seed)
+        model = self.initial_model()
+        sp = self.app_client.algod_client.suggested_params()
+        sp.flat_fee = True
+        # Enough for the inner transactions of any step, pooled across the group.
+        sp.fee = 3 * sp.min_fee
+        candidates = [random_sequence(rng, model, max_length) for _ in range(sequences)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda seq: self.check(model, seq, sp), candidates)
+            return [mismatch for mismatch in results if mismatch is not None]
+
+    def check(
+        self,
+        model: DaoModel,
+        sequence: list[Step],
+        sp: transaction.SuggestedParams,
+    ) -> str | None:
+        failed_step, reads = expected_outcome(model, sequence)
+        txn_group = simulate_atc(
+            self.app_client.algod_client, self.compose(sequence, sp)
+        )
+        failed_at = txn_group.get("failed-at")
+        actual_failed_step = failed_at[0] if failed_at else None
+        if txn_group.get("failure-message") and actual_failed_step is None:
+            return f"{sequence}: {txn_group['failure-message']}"
+        if actual_failed_step != failed_step:
+            return (
+                f"{sequence}: expected failure at {failed_step}, "
+                f"got {actual_failed_step}"
+            )
+        if failed_step is not None:
+            return None
+
+        txn_results = txn_group["txn-results"]
+        for i, (total, in_favor) in reads:
+            actual = decode_return(self.get_votes_method, txn_results[i]["txn-result"])
+            if actual != [total, in_favor] or actual[1] > actual[0]:
+                return f"{sequence}: step {i} read {actual}, expected {total, in_favor}"
+        return None
+
+    def compose(
+        self, sequence: list[Step], sp: transaction.SuggestedParams
+    ) -> AtomicTransactionComposer:
+        atc = AtomicTransactionComposer()
+        for i, step in enumerate(sequence):
+            voter = self.voters[step.voter]
+            # The note keeps repeated steps from being duplicate transactions.
+            parameters = TransactionParameters(
+                sender=voter.address,
+                signer=voter.signer,
+                suggested_params=sp,
+                note=f"{i}",
+            )
+            match step.kind:
+                case "register":
+                    self.app_client.compose_opt_in(
+                        atc,
+                        "register",
+                        parameters,
+                        registered_asa=self.registered_asa_id,
+                    )
+                case "vote":
+                    self.app_client.compose_call(
+                        atc,
+                        "vote",
+                        parameters,
+                        in_favor=step.in_favor,
+                        registered_asa=self.registered_asa_id,
+                    )
+                case "deregister":
+                    self.app_client.compose_close_out(
+                        atc,
+                        "deregister",
+                        parameters,
+                        registered_asa=self.registered_asa_id,
+                    )
+                case "clear_state":
+                    self.app_client.compose_clear_state(atc, parameters)
+                case "get_votes":
+                    self.app_client.compose_call(atc, "get_votes", parameters)
+        return atc
@@ -0,0 +1,61 @@
+import random
+import statistics
+
+import pytest
+from fuzz import DaoModel, Step, VoterModel, expected_outcome, random_sequence
+
+
+def test_model_follows_the_voting_story():
+    model = DaoModel(
+        votes_total=None, votes_in_favor=0, voters=[VoterModel(), VoterModel()]
+    )
+    sequence = [
+        Step("register", 0),
+        Step("vote", 0, in_favor=True),
+        Step("register", 1),
+        Step("vote", 1, in_favor=False),
+        Step("get_votes", 0),
+        Step("clear_state", 1),
+        Step("get_votes", 0),
+        Step("deregister", 0),
+        Step("get_votes", 1),
+        Step("register", 0),
+    ]
+
+    failed_step, reads = expected_outcome(model, sequence)
+
+    # The deregistered voter still holds a frozen registered ASA.
+    assert failed_step == 9
+    assert reads == [(4, (2, 1)), (6, (1, 1)), (8, (0, 0))]
+    assert model.votes_total is None
+
+
+def test_model_rejects_reads_before_the_first_vote():
+    model = DaoModel(votes_total=None, votes_in_favor=0, voters=[VoterModel()])
+    assert expected_outcome(model, [Step("register", 0), Step("get_votes", 0)]) == (
+        1,
+        [],
+    )
+
+
+@pytest.mark.parametrize("votes_total", [None, 5])
+def test_sequences_walk_deep_into_the_model(votes_total: int | None):
+    model = DaoModel(
+        votes_total=votes_total,
+        votes_in_favor=2,
+        voters=[VoterModel() for _ in range(4)],
+    )
+    rng = random.Random(0)
+    depths = []
+    failures = 0
+    for _ in range(300):
+        sequence = random_sequence(rng, model, 16)
+        failed_step, _ = expected_outcome(model, sequence)
+        if failed_step is not None:
+            # Only the last step of a sequence is meant to fail.
+            assert failed_step == len(sequence) - 1
+            failures += 1
+        depths.append(len(sequence) if failed_step is None else failed_step)
+
+    assert statistics.mean(depths) > 12
+    assert 40 < failures < 110
@@ -0,0 +1,89 @@
+import base64
+from pathlib import Path
+
+from algosdk import account
+from fakes import FakeAlgod
+
+from smart_contracts.helpers.history import VOTE_METHOD, TallyHistory
+from smart_contracts.helpers.tally import Tally
+
+APP_ID = 1_234
+A, B, C = (account.generate_account()[1] for _ in range(3))
+
+
+def app_call(sender: str, on_complete: str, *args: bytes, app_id: int = APP_ID) -> dict:
+    return {
+        "sender": sender,
+        "application-transaction": {
+            "application-id": app_id,
+            "on-completion": on_complete,
+            "application-args": [base64.b64encode(arg).decode() for arg in args],
+        },
+    }
+
+
+def vote(sender: str, *, in_favor: bool) -> dict:
+    return app_call(
+        sender, "noop", VOTE_METHOD.get_selector(), b"\x80" if in_favor else b"\x00"
+    )
+
+
+HISTORY = {
+    4: [app_call(A, "optin", b"register"), app_call(B, "optin", b"register")],
+    5: [vote(A, in_favor=True)],
+    6: [vote(B, in_favor=False)],
+    8: [app_call(A, "closeout", b"deregister")],
+    9: [
+        {
+            **app_call(C, "noop", b"other", app_id=99),
+            "inner-txns": [vote(C, in_favor=True)],
+        }
+    ],
+}
+
+
+class FakeIndexer:
+    def __init__(self, current_round: int) -> None:
+        self.current_round = current_round
+        self.searches: list[tuple[int, int]] = []
+
+    def search_transactions(
+        self, application_id: int, min_round: int, max_round: int, **_: object
+    ) -> dict:
+        self.searches.append((min_round, max_round))
+        return {
+            "current-round": self.current_round,
+            "transactions": [
+                {**txn, "confirmed-round": round_}
+                for round_, txns in sorted(HISTORY.items())
+                if min_round <= round_ <= max_round
+                for txn in txns
+            ],
+        }
+
+
+def test_tallies_replay_from_the_nearest_checkpoint(tmp_path: Path):
+    indexer = FakeIndexer(current_round=10)
+    history = TallyHistory(FakeAlgod([]), indexer, APP_ID, cache_path=tmp_path)
+
+    state = history.state_at(7)
+    assert state.votes == {A: True, B: False}
+    assert state.tally == Tally(2, 1)
+    assert history.tally_at(9) == Tally(2, 1)
+    assert history.state_at(9).votes == {B: False, C: True}
+    assert indexer.searches == [(1, 7), (8, 9)]
+
+    # Rounds past the indexer are answered but not cached.
+    assert history.tally_at(20) == Tally(2, 1)
+    assert sorted(path.name for path in tmp_path.glob("*/*/*.json")) == [
+        "7.json",
+        "9.json",
+    ]
+
+    fresh = TallyHistory(FakeAlgod([]), FakeIndexer(10), APP_ID, cache_path=tmp_path)
+    assert fresh.turnout([9, 3, 5, 8]) == [
+        (3, Tally(0, 0)),
+        (5, Tally(1, 1)),
+        (8, Tally(1, 0)),
+        (9, Tally(2, 1)),
+    ]
@@ -0,0 +1,20 @@
+from smart_contracts.helpers.proposal import (
+    CHUNK_SIZE,
+    document_min_balance,
+    encode_document,
+    split_chunks,
+)
+
+
+def test_chunks_rebuild_the_compressed_document():
+    document = "This is a much longer proposal. " * 1_000
+    data = encode_document(document, compress=True)
+    chunks = split_chunks(data)
+
+    assert len(data) < len(document)
+    assert all(len(chunk) <= CHUNK_SIZE for chunk in chunks)
+    assert b"".join(chunks) == data
+    assert document_min_balance(data) == sum(
+        2_500 + 400 * (8 + len(chunk)) for chunk in chunks
+    )
+    assert split_chunks(b"") == []
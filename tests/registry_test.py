@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+import pytest
+from algokit_utils import AppDeployMetaData, AppLookup, AppMetaData
+from algosdk import transaction
+from algosdk.error import AlgodHTTPError
+
+from smart_contracts.helpers import registry
+from smart_contracts.helpers.registry import REGISTRY_VERSION, AppRegistry
+
+CREATOR = "CREATOR"
+
+
+def app(app_id: int, *, deleted: bool = False) -> AppMetaData:
+    return AppMetaData(
+        name="dao",
+        version="v1",
+        deletable=True,
+        updatable=True,
+        app_id=app_id,
+        app_address=f"ADDRESS{app_id}",
+        created_round=app_id,
+        updated_round=app_id,
+        created_metadata=AppDeployMetaData("dao", "v1", deletable=True, updatable=True),
+        deleted=deleted,
+    )
+
+
+class FakeAlgod:
+    """Algod whose creator has the `programs` apps, recording each lookup."""
+
+    def __init__(self, programs: dict[int, str]) -> None:
+        self.programs = programs
+        self.lookups: list[tuple[str, object]] = []
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        return transaction.SuggestedParams(fee=0, first=1, last=2, gh="A" * 44)
+
+    def account_info(self, address: str, exclude: str | None = None) -> dict:
+        self.lookups.append(("account", exclude))
+        return {"address": address, "total-created-apps": len(self.programs)}
+
+    def application_info(self, app_id: int) -> dict:
+        self.lookups.append(("app", app_id))
+        if app_id not in self.programs:
+            raise AlgodHTTPError("application does not exist", 404)
+        return {
+            "id": app_id,
+            "params": {"creator": CREATOR, "approval-program": self.programs[app_id]},
+        }
+
+
+@pytest.fixture()
+def indexer_lookups(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    lookups: list[str] = []
+
+    def get_creator_apps(indexer_client: object, creator: str) -> AppLookup:
+        lookups.append(creator)
+        return AppLookup(creator, {})
+
+    monkeypatch.setattr(registry, "get_creator_apps", get_creator_apps)
+    return lookups
+
+
+def test_record_and_lookup_round_trip(tmp_path: Path, indexer_lookups: list[str]):
+    path = tmp_path / "registry.json"
+    algod = FakeAlgod({5: "program"})
+    AppRegistry(path).record(algod, AppLookup(CREATOR, {"dao": app(5)}))
+
+    assert json.loads(path.read_text())["version"] == REGISTRY_VERSION
+    assert [p.name for p in tmp_path.iterdir()] == ["registry.json"]
+    algod.lookups.clear()
+    lookup = AppRegistry(path).lookup(algod, None, CREATOR, "dao")
+    assert lookup == AppLookup(CREATOR, {"dao": app(5)})
+    assert indexer_lookups == []
+    # Neither lookup grows with the number of apps the creator has.
+    assert algod.lookups == [("account", "all"), ("app", 5)]
+
+
+@pytest.mark.parametrize(
+    "programs",
+    [
+        pytest.param({}, id="deleted"),
+        pytest.param({6: "program"}, id="replaced elsewhere"),
+        pytest.param({5: "updated program"}, id="updated elsewhere"),
+        pytest.param({5: "program", 7: "program"}, id="appended elsewhere"),
+    ],
+)
+def test_stale_entries_fall_back_to_indexer(
+    tmp_path: Path, indexer_lookups: list[str], programs: dict[int, str]
+):
+    path = tmp_path / "registry.json"
+    AppRegistry(path).record(
+        FakeAlgod({5: "program"}), AppLookup(CREATOR, {"dao": app(5)})
+    )
+
+    lookup = AppRegistry(path).lookup(FakeAlgod(programs), None, CREATOR, "dao")
+    assert lookup == AppLookup(CREATOR, {})
+    assert indexer_lookups == [CREATOR]
+
+
+def test_deleted_and_unknown_apps(tmp_path: Path, indexer_lookups: list[str]):
+    path = tmp_path / "registry.json"
+    algod = FakeAlgod({})
+    AppRegistry(path).record(algod, AppLookup(CREATOR, {"dao": app(5, deleted=True)}))
+
+    assert AppRegistry(path).lookup(algod, None, CREATOR, "dao").apps["dao"].deleted
+    AppRegistry(path).lookup(algod, None, CREATOR, "other")
+    assert indexer_lookups == [CREATOR]
+
+
+def test_other_versions_are_ignored(tmp_path: Path, indexer_lookups: list[str]):
+    path = tmp_path / "registry.json"
+    algod = FakeAlgod({5: "program"})
+    AppRegistry(path).record(algod, AppLookup(CREATOR, {"dao": app(5)}))
+    data = json.loads(path.read_text())
+    path.write_text(json.dumps({**data, "version": REGISTRY_VERSION - 1}))
+
+    AppRegistry(path).lookup(algod, None, CREATOR, "dao")
+    assert indexer_lookups == [CREATOR]
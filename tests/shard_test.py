@@ -0,0 +1,16 @@
+import hashlib
+
+from algosdk import account, encoding
+
+from smart_contracts.helpers.shard import shard_of
+
+
+def test_shard_of_matches_register_check():
+    addresses = [account.generate_account()[1] for _ in range(200)]
+    shards = [shard_of(address, 4) for address in addresses]
+
+    assert set(shards) == {0, 1, 2, 3}
+    for address, shard in zip(addresses, shards, strict=True):
+        digest = hashlib.new("sha512_256", encoding.decode_address(address)).digest()
+        assert shard == int.from_bytes(digest[:8], "big") % 4
+        assert shard_of(address, 1) == 0
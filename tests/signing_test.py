@@ -0,0 +1,42 @@
+import algosdk
+from algokit_utils import Account
+from algosdk import encoding, transaction
+from algosdk.atomic_transaction_composer import TransactionWithSigner
+from fakes import FakeAlgod, payment
+
+from smart_contracts.helpers.signing import SigningPool
+from smart_contracts.helpers.submit import SubmissionScheduler, sign_group
+
+
+def test_pool_signs_in_order_and_submits():
+    accounts = [
+        Account(private_key=algosdk.account.generate_account()[0]) for _ in range(3)
+    ]
+    groups = []
+    for amount in range(50):
+        txns = [payment(account, amount).txn for account in accounts[: amount % 3 + 1]]
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        groups.append(txns)
+    signers = {account.address: account.signer for account in accounts}
+    expected = [
+        sign_group([TransactionWithSigner(txn, signers[txn.sender]) for txn in group])
+        for group in groups
+    ]
+
+    algod = FakeAlgod([])
+    with SigningPool(accounts, max_workers=2, batch_size=4) as pool:
+        signed = list(pool.sign_groups(groups))
+        assert [[encoding.msgpack_encode(s) for s in g] for g in signed] == [
+            [encoding.msgpack_encode(s) for s in g] for g in expected
+        ]
+        assert pool.signer.sign_transactions(groups[1], [1]) == expected[1][1:]
+
+        with SubmissionScheduler(
+            algod, rate=1_000.0, sleep=lambda _: None
+        ) as scheduler:
+            futures = pool.submit(scheduler, groups)
+            txids = [future.result(timeout=5) for future in futures]
+
+    assert txids == [group[0].get_txid() for group in groups]
+    assert algod.sent == expected
@@ -0,0 +1,87 @@
+import queue
+
+import algosdk
+import pytest
+from algokit_utils import Account
+from algosdk.error import AlgodHTTPError
+from fakes import FakeAlgod, payment
+
+from smart_contracts.helpers.submit import (
+    POOL_FULL,
+    TXN_DEAD,
+    SubmissionScheduler,
+)
+
+
+def test_retries_with_backoff_and_resigns_dead_transactions():
+    account = Account(private_key=algosdk.account.generate_account()[0])
+    algod = FakeAlgod([POOL_FULL, f"{TXN_DEAD}: round 3 outside of 1--2"])
+    with SubmissionScheduler(algod, rate=8.0, sleep=lambda _: None) as scheduler:
+        future = scheduler.submit([payment(account, 1), payment(account, 2)])
+        assert scheduler.submit([payment(account, 1), payment(account, 2)]) is future
+        txid = future.result(timeout=5)
+
+    (signed,) = algod.sent
+    assert signed[0].get_txid() == txid
+    assert signed[0].transaction.first_valid_round == 100
+    assert signed[0].transaction.group == signed[1].transaction.group
+    metrics = scheduler.metrics
+    assert metrics.submitted == 1
+    assert metrics.retries == 2
+    assert metrics.resigned == 1
+    assert metrics.queue_depth == 0
+    assert metrics.rate == 5.0
+
+
+def test_forgets_groups_that_failed_to_queue():
+    account = Account(private_key=algosdk.account.generate_account()[0])
+    algod = FakeAlgod([])
+    scheduler = SubmissionScheduler(algod, max_queue_size=1, sleep=lambda _: None)
+    first = scheduler.submit([payment(account, 1)])
+    with pytest.raises(queue.Full):
+        scheduler.submit([payment(account, 2)], timeout=0.01)
+
+    with scheduler:
+        retried = scheduler.submit([payment(account, 2)])
+        assert retried.result(timeout=5) == payment(account, 2).txn.get_txid()
+        assert first.result(timeout=5) == payment(account, 1).txn.get_txid()
+
+
+def test_evicts_finished_groups_under_every_key():
+    account = Account(private_key=algosdk.account.generate_account()[0])
+    algod = FakeAlgod([f"{TXN_DEAD}: round 3 outside of 1--2", "logic eval error"])
+    with SubmissionScheduler(algod, sleep=lambda _: None) as scheduler:
+        failed = scheduler.submit([payment(account, 1)])
+        with pytest.raises(AlgodHTTPError):
+            failed.result(timeout=5)
+
+        retried = scheduler.submit([payment(account, 1)])
+        assert retried is not failed
+        txid = retried.result(timeout=5)
+        assert not scheduler._submissions
+
+        again = scheduler.submit([payment(account, 1)])
+        assert again.result(timeout=5) == txid
+    assert len(algod.sent) == 1
+
+
+def test_looks_up_only_dead_groups_before_resigning():
+    account = Account(private_key=algosdk.account.generate_account()[0])
+    algod = FakeAlgod([POOL_FULL, f"{TXN_DEAD}: round 3 outside of 1--2", POOL_FULL])
+    with SubmissionScheduler(algod, sleep=lambda _: None) as scheduler:
+        future = scheduler.submit([payment(account, 1)])
+        future.result(timeout=5)
+
+    assert algod.looked_up == [payment(account, 1).txn.get_txid()]
+
+
+def test_stop_without_start_leaves_queued_groups():
+    account = Account(private_key=algosdk.account.generate_account()[0])
+    algod = FakeAlgod([])
+    scheduler = SubmissionScheduler(algod, sleep=lambda _: None)
+    future = scheduler.submit([payment(account, 1)])
+    scheduler.stop()
+    assert not future.done()
+
+    with scheduler:
+        assert future.result(timeout=5) == payment(account, 1).txn.get_txid()
@@ -0,0 +1,76 @@
+from algokit_utils import ApplicationClient, OnCompleteCallParameters
+from algosdk import account, encoding, transaction
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer, EmptySigner
+from algosdk.v2client.algod import AlgodClient
+
+from smart_contracts.helpers.templates import register_template, vote_template
+from smart_contracts.solution import contract as solution_contract
+
+SP = transaction.SuggestedParams(
+    1_000,
+    100,
+    1_100,
+    "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=",
+    "testnet-v1.0",
+    flat_fee=True,
+)
+
+
+def composed_call(
+    app_client: ApplicationClient,
+    method: str,
+    sender: str,
+    sp: transaction.SuggestedParams,
+    on_complete: transaction.OnComplete = transaction.OnComplete.NoOpOC,
+    **abi_kwargs: object,
+) -> str:
+    atc = AtomicTransactionComposer()
+    app_client.compose_call(
+        atc,
+        method,
+        OnCompleteCallParameters(
+            sender=sender,
+            signer=EmptySigner(),
+            suggested_params=sp,
+            on_complete=on_complete,
+        ),
+        **abi_kwargs,
+    )
+    txn = atc.txn_list[0].txn
+    txn.group = None
+    return encoding.msgpack_encode(txn)
+
+
+def test_templates_match_composed_calls():
+    # No request reaches algod, the suggested params are always given.
+    app_client = ApplicationClient(
+        AlgodClient("", "http://localhost:1"),
+        solution_contract.app.build(),
+        app_id=1_234,
+    )
+    vote = vote_template(app_client, 77, SP)
+    register = register_template(app_client, 77, SP)
+
+    later = transaction.SuggestedParams(1_000, 500, 1_500, SP.gh, SP.gen, flat_fee=True)
+    for sp in (SP, later):
+        for _ in range(3):
+            sender = account.generate_account()[1]
+            for in_favor in (True, False):
+                assert encoding.msgpack_encode(
+                    vote.build(sender, sp, in_favor)
+                ) == composed_call(
+                    app_client,
+                    "vote",
+                    sender,
+                    sp,
+                    in_favor=in_favor,
+                    registered_asa=77,
+                )
+            assert encoding.msgpack_encode(register.build(sender, sp)) == composed_call(
+                app_client,
+                "register",
+                sender,
+                sp,
+                transaction.OnComplete.OptInOC,
+                registered_asa=77,
+            )
@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar
+
+import pytest
+from algosdk.error import AlgodHTTPError
+
+from smart_contracts.helpers.transport import PooledAlgodClient, PooledTransport
+
+
+class AlgodHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: ClassVar[set[int]] = set()
+
+    def do_GET(self) -> None:
+        AlgodHandler.connections.add(id(self.connection))
+        if self.path.endswith("/slow"):
+            time.sleep(1)
+        if self.path.startswith("/v2/applications/"):
+            status, body = 404, {"message": "application does not exist"}
+        else:
+            status, body = 200, {"last-round": 7}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def algod_address() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), AlgodHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_requests_reuse_connections_and_record_latency(algod_address: str):
+    transport = PooledTransport(algod_address, pool_size=1)
+    client = PooledAlgodClient("a" * 64, algod_address, transport=transport)
+    AlgodHandler.connections.clear()
+
+    assert client.status() == {"last-round": 7}
+    assert client.status() == {"last-round": 7}
+    with pytest.raises(AlgodHTTPError, match="application does not exist"):
+        client.application_info(1234)
+
+    assert len(AlgodHandler.connections) == 1
+    stats = transport.latency_stats()
+    assert stats["GET /v2/status"].count == 2
+    assert stats["GET /v2/applications/{id}"].count == 1
+
+
+def test_sdk_calls_use_the_transport_timeout(algod_address: str):
+    transport = PooledTransport(algod_address, pool_size=1, timeout=0.2)
+    client = PooledAlgodClient("a" * 64, algod_address, transport=transport)
+
+    with pytest.raises(TimeoutError):
+        client.algod_request("GET", "/slow")
+    assert client.status() == {"last-round": 7}
+
+
+def test_pool_size_and_timeout_are_read_when_the_transport_is_made(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("HTTP_POOL_SIZE", "3")
+    monkeypatch.setenv("HTTP_TIMEOUT", "0.5")
+    transport = PooledTransport("http://localhost:4001")
+
+    assert transport.timeout == 0.5
+    assert transport._pool.qsize() == 3
+    assert PooledTransport("http://localhost:4001", 2, 5).timeout == 5